@@ -3,23 +3,524 @@
     Última modificación: 18 de septiembre de 2025
 """
 
+import time
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import deque
+from collections.abc import Mapping
+from itertools import combinations
 from graphviz import Digraph
 
 """
     Podéis implementar cualquier función auxiliar que consideréis necesaria
 """
 
+class CompiledAutomaton:
+    """Dense transition table of a deterministic automaton."""
+
+    def __init__(self, automaton):
+        # Numeramos los estados: primero los alcanzables (en anchura) desde el inicial
+        self.state_index = {automaton.initial_state: 0}
+        self.states = [automaton.initial_state]
+        queue = deque([automaton.initial_state])
+        while queue:
+            state = queue.popleft()
+            for targets in automaton.get_transitions_from_state(state).values():
+                for target in targets:
+                    if target not in self.state_index:
+                        self.state_index[target] = len(self.states)
+                        self.states.append(target)
+                        queue.append(target)
+        for state in list(automaton.states) + list(automaton.transitions):
+            if state not in self.state_index:
+                self.state_index[state] = len(self.states)
+                self.states.append(state)
+
+        # Cada símbolo ocupa una columna de la tabla
+        symbols = dict.fromkeys(automaton.symbols)
+        for symbol_transitions in automaton.transitions.values():
+            symbols.update(dict.fromkeys(symbol_transitions))
+        symbols.pop(None, None)
+        self.symbols = tuple(symbols)
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.n_symbols = len(self.symbols)
+
+        # -1 indica que no hay transición (se rechaza la cadena)
+        self.table = array('i', [-1]) * (len(self.states) * self.n_symbols)
+        for state, symbol_transitions in automaton.transitions.items():
+            row = self.state_index[state] * self.n_symbols
+            for symbol, targets in symbol_transitions.items():
+                if not targets:
+                    continue
+                if symbol is None or len(targets) > 1:
+                    raise ValueError("Automaton is not deterministic")
+                for target in targets:
+                    self.table[row + self.symbol_index[symbol]] = self.state_index[target]
+
+        self.initial = 0
+        self.dead = -1
+        self.final = bytearray(len(self.states))
+        for state in automaton.final_states:
+            if state in self.state_index:
+                self.final[self.state_index[state]] = 1
+
+        # Estados desde los que se puede llegar a un final
+        self.live = bytearray(len(self.states))
+        for state in automaton._coreachable_states():
+            if state in self.state_index:
+                self.live[self.state_index[state]] = 1
+
+    @classmethod
+    def from_buffers(cls, symbols, table, final, live, initial=0):
+        """Build a compiled automaton over existing (e.g. memory-mapped) buffers."""
+        # Los estados no tienen nombre: se identifican por su índice
+        compiled = cls.__new__(cls)
+        compiled.states = range(len(final))
+        compiled.state_index = None
+        compiled.symbols = tuple(symbols)
+        compiled.symbol_index = {symbol: i for i, symbol in enumerate(compiled.symbols)}
+        compiled.n_symbols = len(compiled.symbols)
+        compiled.table = table
+        compiled.initial = initial
+        compiled.dead = -1
+        compiled.final = final
+        compiled.live = live
+        return compiled
+
+    def __getstate__(self):
+        # Al serializar se omite el índice de estados (se reconstruye al cargar)
+        # y las vistas de memoria se copian
+        state = self.__dict__.copy()
+        del state["state_index"]
+        state.pop("_buffer", None)
+        if not isinstance(self.table, array):
+            state["table"] = array('i', self.table)
+            state["final"] = bytearray(self.final)
+            state["live"] = bytearray(self.live)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.state_index = {name: i for i, name in enumerate(self.states)}
+
+    def step(self, state, symbol):
+        column = self.symbol_index.get(symbol)
+        if column is None or state < 0:
+            return -1
+        return self.table[state * self.n_symbols + column]
+
+    def is_final(self, state):
+        return state >= 0 and self.final[state] == 1
+
+    def is_dead(self, state):
+        return state < 0 or self.live[state] == 0
+
+    def encode(self, cadenas, width=None):
+        """Encode strings as a (batch, width) NumPy array of table columns."""
+        import numpy as np
+
+        # Columna n_symbols: relleno (no cambia de estado);
+        # columna n_symbols + 1: símbolo desconocido (lleva al estado muerto)
+        padding = self.n_symbols
+        unknown = self.n_symbols + 1
+        cadenas = list(cadenas)
+        if width is None:
+            width = max((len(cadena) for cadena in cadenas), default=0)
+        encoded = np.full((len(cadenas), width), padding, dtype=np.int32)
+        columns = self.symbol_index
+        for row, cadena in enumerate(cadenas):
+            if len(cadena) > width:
+                raise ValueError(f"String longer than width {width}: {cadena}")
+            encoded[row, :len(cadena)] = [columns.get(symbol, unknown) for symbol in cadena]
+        return encoded
+
+    def accepts_encoded(self, encoded):
+        """Evaluate a batch encoded by encode, returning a NumPy bool array."""
+        import numpy as np
+
+        # Tabla (n + 1) x (n_symbols + 2): la fila n es el estado muerto
+        n_states = len(self.states)
+        dead = n_states
+        table = np.full((n_states + 1, self.n_symbols + 2), dead, dtype=np.int32)
+        body = np.frombuffer(self.table, dtype=np.int32).reshape(n_states, self.n_symbols)
+        table[:n_states, :self.n_symbols] = np.where(body < 0, dead, body)
+        table[:, self.n_symbols] = np.arange(n_states + 1)
+        final = np.zeros(n_states + 1, dtype=bool)
+        final[:n_states] = np.frombuffer(bytes(self.final), dtype=np.uint8) == 1
+
+        encoded = np.asarray(encoded)
+        states = np.full(encoded.shape[0], self.initial, dtype=np.int32)
+        for position in range(encoded.shape[1]):
+            states = table[states, encoded[:, position]]
+        return final[states]
+
+    def accepts(self, cadena):
+        table = self.table
+        columns = self.symbol_index
+        n_symbols = self.n_symbols
+        state = self.initial
+        for symbol in cadena:
+            column = columns.get(symbol)
+            if column is None:
+                return False
+            state = table[state * n_symbols + column]
+            if state < 0:
+                return False
+        return self.final[state] == 1
+
+
+class BitsetAutomaton:
+    """NFA simulation where the set of active states is an int bitmask."""
+
+    def __init__(self, automaton):
+        self.states = list(dict.fromkeys(
+            [automaton.initial_state]
+            + list(automaton.states)
+            + list(automaton.transitions)
+            + [target
+               for symbol_transitions in automaton.transitions.values()
+               for targets in symbol_transitions.values()
+               for target in targets]
+        ))
+        self.state_index = {state: i for i, state in enumerate(self.states)}
+
+        # Máscara del cierre lambda de cada componente, en orden topológico
+        # inverso: sus estados más las máscaras (ya hechas) de sus sucesoras
+        component_of, members, successors = automaton._lambda_components()
+        component_masks = []
+        for component, component_members in enumerate(members):
+            mask = 0
+            for member in component_members:
+                mask |= 1 << self.state_index[member]
+            for next_component in successors[component]:
+                mask |= component_masks[next_component]
+            component_masks.append(mask)
+
+        # Máscara del cierre lambda de cada estado
+        closure_masks = []
+        for i, state in enumerate(self.states):
+            component = component_of.get(state)
+            closure_masks.append(1 << i if component is None else component_masks[component])
+
+        # Para cada símbolo, máscara de sucesores (ya cerrados por lambda) de cada estado
+        self.successors = {}
+        for state, symbol_transitions in automaton.transitions.items():
+            i = self.state_index[state]
+            for symbol, targets in symbol_transitions.items():
+                if symbol is None:
+                    continue
+                row = self.successors.setdefault(symbol, [0] * len(self.states))
+                for target in targets:
+                    row[i] |= closure_masks[self.state_index[target]]
+
+        self.initial = closure_masks[0]
+        self.dead = 0
+        self.final = 0
+        for state in automaton.final_states:
+            if state in self.state_index:
+                self.final |= 1 << self.state_index[state]
+
+        # Estados desde los que se puede llegar a un final
+        self.live = 0
+        for state in automaton._coreachable_states():
+            if state in self.state_index:
+                self.live |= 1 << self.state_index[state]
+
+    def step(self, current, symbol):
+        row = self.successors.get(symbol)
+        if row is None:
+            return 0
+        active = current
+        current = 0
+        while active:
+            lowest = active & -active
+            current |= row[lowest.bit_length() - 1]
+            active ^= lowest
+        return current
+
+    def is_final(self, current):
+        return bool(current & self.final)
+
+    def is_dead(self, current):
+        return not current & self.live
+
+    def accepts(self, cadena):
+        successors = self.successors
+        current = self.initial
+        for symbol in cadena:
+            row = successors.get(symbol)
+            if row is None:
+                return False
+            active = current
+            current = 0
+            while active:
+                lowest = active & -active
+                current |= row[lowest.bit_length() - 1]
+                active ^= lowest
+            if not current:
+                return False
+        return bool(current & self.final)
+
+
+class Matcher:
+    """Resumable evaluation of a string received in chunks."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.state = engine.initial
+        self.consumed = 0
+
+    def feed(self, chunk):
+        # Devuelve False (y deja de leer) en cuanto se llega a un estado muerto
+        engine = self.engine
+        state = self.state
+        if engine.is_dead(state):
+            return False
+        for position, symbol in enumerate(chunk):
+            state = engine.step(state, symbol)
+            if engine.is_dead(state):
+                self.state = state
+                self.consumed += position + 1
+                return False
+        self.state = state
+        self.consumed += len(chunk)
+        return True
+
+    def consume(self, chunks):
+        # Lee trozos (de un generador, fichero, socket...) hasta el final o
+        # hasta llegar a un estado muerto
+        for chunk in chunks:
+            if not self.feed(chunk):
+                break
+        return self.is_accepting()
+
+    def is_accepting(self):
+        return self.engine.is_final(self.state)
+
+    def dead(self):
+        return self.engine.is_dead(self.state)
+
+
+class CompactTransitions(Mapping):
+    """
+    Read-only view of the transitions of an automaton stored in CSR arrays.
+
+    States are numbered by their position in ``names`` and symbols by their
+    position in ``symbols``. The edges leaving state ``i`` are
+    ``offsets[i]:offsets[i + 1]`` of ``edge_symbols`` and ``targets``
+    (``array('I')``), sorted by symbol. The view behaves as the usual
+    ``dict[state][symbol] -> set of states``, with frozensets as values.
+    """
+
+    __slots__ = (
+        "names", "state_index", "symbols", "symbol_index",
+        "offsets", "edge_symbols", "targets",
+    )
+
+    def __init__(self, names, symbols, offsets, edge_symbols, targets):
+        """
+        Args:
+            names: Name of each state. Type: List[str]
+            symbols: Symbol of each symbol id (``None`` is lambda). Type: Sequence
+            offsets: First edge of each state, plus the number of edges.
+                Type: array
+            edge_symbols: Symbol id of each edge. Type: array
+            targets: Target state id of each edge. Type: array
+
+        """
+        self.names = names
+        self.state_index = {name: i for i, name in enumerate(names)}
+        self.symbols = tuple(symbols)
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.offsets = offsets
+        self.edge_symbols = edge_symbols
+        self.targets = targets
+
+    @classmethod
+    def from_dict(cls, transitions):
+        """
+        Build the compact form of a transition dictionary.
+
+        Args:
+            transitions: Transitions as ``dict[state][symbol] -> set of
+                states``. Type: Mapping
+
+        Returns:
+            Compact transitions. Type: CompactTransitions
+
+        """
+        state_index = dict.fromkeys(transitions)
+        symbol_index = {}
+        for symbol_transitions in transitions.values():
+            for symbol, targets in symbol_transitions.items():
+                symbol_index.setdefault(symbol, len(symbol_index))
+                state_index.update(dict.fromkeys(targets))
+        for i, state in enumerate(state_index):
+            state_index[state] = i
+
+        offsets = array('I', [0])
+        edge_symbols = array('I')
+        targets = array('I')
+        for state in state_index:
+            row = transitions.get(state, {})
+            for symbol in sorted(row, key=symbol_index.__getitem__):
+                ids = sorted(state_index[target] for target in row[symbol])
+                edge_symbols.extend([symbol_index[symbol]] * len(ids))
+                targets.extend(ids)
+            offsets.append(len(targets))
+        return cls(list(state_index), list(symbol_index), offsets, edge_symbols, targets)
+
+    def to_dict(self):
+        """Copy the transitions as a mutable dictionary of sets."""
+        return {
+            state: {symbol: set(targets) for symbol, targets in row.items()}
+            for state, row in self.items()
+        }
+
+    def __getitem__(self, state):
+        i = self.state_index[state]
+        if self.offsets[i] == self.offsets[i + 1]:
+            raise KeyError(state)
+        return _CompactRow(self, self.offsets[i], self.offsets[i + 1])
+
+    def __contains__(self, state):
+        i = self.state_index.get(state)
+        return i is not None and self.offsets[i] != self.offsets[i + 1]
+
+    def __iter__(self):
+        offsets = self.offsets
+        for i, name in enumerate(self.names):
+            if offsets[i] != offsets[i + 1]:
+                yield name
+
+    def __len__(self):
+        offsets = self.offsets
+        return sum(offsets[i] != offsets[i + 1] for i in range(len(self.names)))
+
+
+class _CompactRow(Mapping):
+    """Transitions leaving one state of a ``CompactTransitions``."""
+
+    __slots__ = ("transitions", "start", "end")
+
+    def __init__(self, transitions, start, end):
+        self.transitions = transitions
+        self.start = start
+        self.end = end
+
+    def __getitem__(self, symbol):
+        transitions = self.transitions
+        symbol_id = transitions.symbol_index.get(symbol)
+        if symbol_id is not None:
+            start = bisect_left(transitions.edge_symbols, symbol_id, self.start, self.end)
+            end = bisect_right(transitions.edge_symbols, symbol_id, start, self.end)
+            if start != end:
+                names = transitions.names
+                return frozenset(names[target] for target in transitions.targets[start:end])
+        raise KeyError(symbol)
+
+    def __iter__(self):
+        transitions = self.transitions
+        previous = None
+        for symbol_id in transitions.edge_symbols[self.start:self.end]:
+            if symbol_id != previous:
+                previous = symbol_id
+                yield transitions.symbols[symbol_id]
+
+    def __contains__(self, symbol):
+        # Sin crear el conjunto de destinos
+        transitions = self.transitions
+        symbol_id = transitions.symbol_index.get(symbol)
+        if symbol_id is None:
+            return False
+        position = bisect_left(transitions.edge_symbols, symbol_id, self.start, self.end)
+        return position < self.end and transitions.edge_symbols[position] == symbol_id
+
+    def items(self):
+        # Un solo recorrido de las aristas, agrupadas por símbolo
+        transitions = self.transitions
+        names = transitions.names
+        edge_symbols = transitions.edge_symbols
+        targets = transitions.targets
+        start = self.start
+        while start < self.end:
+            symbol_id = edge_symbols[start]
+            end = start + 1
+            while end < self.end and edge_symbols[end] == symbol_id:
+                end += 1
+            yield transitions.symbols[symbol_id], frozenset(names[target] for target in targets[start:end])
+            start = end
+
+    def __len__(self):
+        return len(set(self.transitions.edge_symbols[self.start:self.end]))
+
+
 class FiniteAutomaton:
 
+    __slots__ = (
+        "initial_state", "states", "symbols", "transitions", "final_states",
+        "_compiled", "_components", "_bitset", "_subsets", "_deterministic",
+    )
+
     def __init__(self, initial_state, states, symbols, transitions, final_states):
         self.initial_state = initial_state
         self.states = states
         self.symbols = symbols
         self.transitions = transitions
         self.final_states = final_states
+        self._compiled = None
+        self._components = None
+        self._bitset = None
+        # None hasta que se comprueba si el autómata es determinista
+        self._deterministic = None
+        # Estados del autómata original que representa cada estado (solo en
+        # los autómatas construidos por _determinize y to_minimized)
+        self._subsets = None
+
+    def compile(self):
+        """Build (once) the dense transition table used by accepts."""
+        if self._compiled is None:
+            self._compiled = CompiledAutomaton(self)
+        return self._compiled
+
+    def _bitset_automaton(self):
+        if self._bitset is None:
+            self._bitset = BitsetAutomaton(self)
+        return self._bitset
+
+    def _clear_cache(self):
+        self._compiled = None
+        self._components = None
+        self._bitset = None
+        self._deterministic = None
+
+    def _is_deterministic(self):
+        # Se recuerda el resultado para no intentar compilar (y descartar la
+        # tabla) en cada llamada sobre un autómata no determinista
+        if self._deterministic is None:
+            self._deterministic = all(
+                not targets or (symbol is not None and len(targets) == 1)
+                for symbol_transitions in self.transitions.values()
+                for symbol, targets in symbol_transitions.items()
+            )
+        return self._deterministic
+
+    def _engine(self):
+        # Tabla compilada si el autómata es determinista; si no, máscaras de bits
+        if self._is_deterministic():
+            return self.compile()
+        return self._bitset_automaton()
+
+    def compact(self):
+        """Store the transitions in CSR arrays (a read-only dict view)."""
+        if not isinstance(self.transitions, CompactTransitions):
+            self.transitions = CompactTransitions.from_dict(self.transitions)
+        return self
 
     def add_transition(self, start_state, symbol, end_state):
+        self._clear_cache()
+        if isinstance(self.transitions, CompactTransitions):
+            self.transitions = self.transitions.to_dict()
         if start_state not in self.transitions:
             self.transitions[start_state] = {}
             
@@ -28,192 +529,493 @@ class FiniteAutomaton:
             
         self.transitions[start_state][symbol].add(end_state)
 
-    def accepts(self, cadena):
+    def accepts(self, cadena, engine=None):
+        # engine: None (tabla compilada si existe o si las transiciones son
+        # compactas, si no conjuntos), "set",
+        # "bitset" (NFA con máscaras de bits) o "table" (compila si hace falta)
+        if engine is None:
+            # compact() también se puede aplicar a un NFA, que no se compila
+            if self._compiled is not None or (
+                isinstance(self.transitions, CompactTransitions) and self._is_deterministic()
+            ):
+                return self.compile().accepts(cadena)
+        elif engine == "table":
+            return self.compile().accepts(cadena)
+        elif engine == "bitset":
+            return self._bitset_automaton().accepts(cadena)
+        elif engine != "set":
+            raise ValueError(f"Unknown engine: {engine}")
+
         current_states = self._lambda_check({self.initial_state})
         
         for symbol in cadena:
             next_states = set()
             for state in current_states:
-                if state in self.transitions and symbol in self.transitions[state]:
-                    next_states |= self.transitions[state][symbol]
+                next_states |= self.get_final_states_from_symbol_transitions(state, symbol)
             current_states = self._lambda_check(next_states)
             if not current_states:
                 return False
             
         return any(s in self.final_states for s in current_states)
+
+    def matcher(self):
+        """Return a Matcher that evaluates a string fed in chunks."""
+        return Matcher(self._engine())
+
+    def accepts_many(self, cadenas):
+        """Evaluate an iterable of strings, returning a bytearray of 0/1."""
+        engine = self._engine()
+
+        # path[i] es el estado tras leer previous[:i]; las cadenas con prefijo
+        # común con la anterior (p. ej. entradas ordenadas) reutilizan ese estado
+        results = bytearray()
+        previous = ""
+        path = [engine.initial]
+        for cadena in cadenas:
+            limit = min(len(cadena), len(path) - 1)
+            common = 0
+            while common < limit and cadena[common] == previous[common]:
+                common += 1
+            del path[common + 1:]
+
+            state = path[-1]
+            for symbol in cadena[common:]:
+                if state == engine.dead:
+                    break
+                state = engine.step(state, symbol)
+                path.append(state)
+
+            results.append(len(path) == len(cadena) + 1 and engine.is_final(state))
+            previous = cadena
+        return results
     
+    def accepts_array(self, cadenas, width=None):
+        """Evaluate a batch of strings with NumPy over the compiled table."""
+        compiled = self.compile()
+        return compiled.accepts_encoded(compiled.encode(cadenas, width))
+
     def to_deterministic(self):
+        return self._determinize({self.initial_state})
+
+    def _determinize(self, initial_states):
+        # Construcción de subconjuntos con lista de trabajo. Cada estado del
+        # autómata determinista es un frozenset de estados (ya cerrado por
+        # lambda) con un nombre compacto "q<i>"; el conjunto vacío es "Empty".
+        symbols = dict.fromkeys(self.symbols)
+        for symbol_transitions in self.transitions.values():
+            symbols.update(dict.fromkeys(symbol_transitions))
+        symbols.pop(None, None)
+        symbols = tuple(symbols)
+
         aut_aux = FiniteAutomaton(
             initial_state="",
             states=set(),
-            symbols=self.symbols,
+            symbols=symbols,
             transitions={},
             final_states=set()
         )
-                
-        # Inicializamos estados alcanzables por lambda desde el inicial
-        new_states_dict = {}
-        initial_states = set()
-        initial_states |= self._lambda_check({self.initial_state})
-        initial_states.add(self.initial_state)
-        initial_states = sorted(initial_states)
-        
-        for state in initial_states :
-            aut_aux.initial_state += state
-            
-        aut_aux.states.add(aut_aux.initial_state)
-        
-        new_states_dict[aut_aux.initial_state] = initial_states
-        
-        # Agregamos el estado vacío
-        aut_aux.states.add("Empty")
 
-        # Procesamos los estados para generar el autómata determinista y cambiamos los nombres
+        # Los destinos se guardan directamente en arrays CSR: los estados se
+        # procesan en el mismo orden en que se numeran
+        ids = {}
+        names = []
+        aut_aux._subsets = {}
 
-        pending = []
-        pending.append(aut_aux.initial_state)
-        
+        def get_id(subset):
+            state_id = ids.get(subset)
+            if state_id is None:
+                state_id = ids[subset] = len(names)
+                name = f"q{state_id}" if subset else "Empty"
+                names.append(name)
+                aut_aux._subsets[name] = subset
+                aut_aux.states.add(name)
+                if not self.final_states.isdisjoint(subset):
+                    aut_aux.final_states.add(name)
+                pending.append(subset)
+            return state_id
+
+        pending = deque()
+        aut_aux.initial_state = names[get_id(frozenset(self._lambda_check(initial_states)))]
+
+        offsets = array('I', [0])
+        edge_symbols = array('I')
+        edge_targets = array('I')
         while pending:
-            state_name = pending.pop(0)
-            state = new_states_dict[state_name]
-            for st in state: 
-                for symbol, states_tr in self.get_transitions_from_state(st).items(): #a
-                    final = 0
-                    if symbol is not None:
-                        if len(states_tr) == 0:
-                            if states_tr == self.get_final_states():
-                                final = 1
+            subset = pending.popleft()
+            
+            # Destinos de todo el subconjunto agrupados por símbolo
+            moves = {}
+            for state in subset:
+                for symbol, targets in self.get_transitions_from_state(state).items():
+                    if symbol is not None and targets:
+                        if symbol in moves:
+                            moves[symbol] |= targets
                         else:
-                            for fs in states_tr:
-                                if fs in self.get_final_states():
-                                    final = 1
-                        n_states = set()
-                        n_state_name = ""
-                        for s in states_tr:
-                            n_states.add(s)
-                            n_states |= self._lambda_check({s})
-                            n_states = sorted(n_states)
-                            for ns in n_states:
-                                n_state_name += ns
-                        new_states_dict[n_state_name] = n_states
-                        if n_state_name not in aut_aux.states:
-                            pending.append(n_state_name)
-                        aut_aux.states.add(n_state_name)
-                        aut_aux.add_transition(state_name, symbol, n_state_name)
-                        if final == 1:
-                            aut_aux.final_states.add(n_state_name)
-                for symbol in self.get_symbols():
-                    if aut_aux.get_transitions_from_state(state_name).get(symbol) == None:
-                        aut_aux.add_transition(state_name, symbol, "Empty")
-                    aut_aux.add_transition("Empty", symbol, "Empty")
+                            moves[symbol] = set(targets)
+
+            for symbol_id, symbol in enumerate(symbols):
+                targets = moves.get(symbol)
+                target = frozenset(self._lambda_check(targets)) if targets else frozenset()
+                edge_symbols.append(symbol_id)
+                edge_targets.append(get_id(target))
+            offsets.append(len(edge_targets))
+
+        aut_aux.transitions = CompactTransitions(names, symbols, offsets, edge_symbols, edge_targets)
         return aut_aux
         
 
-    def to_minimized(self):
-        aut_aux = FiniteAutomaton(
+    def intersect(self, other):
+        """Deterministic automaton of the strings accepted by both automata."""
+        return self._product(other, lambda final1, final2: final1 and final2)
+
+    def difference(self, other):
+        """Deterministic automaton of the strings accepted by self but not by other."""
+        return self._product(other, lambda final1, final2: final1 and not final2)
+
+    def xor(self, other):
+        """Deterministic automaton of the strings accepted by exactly one automaton."""
+        return self._product(other, lambda final1, final2: final1 != final2)
+
+    def complement(self, symbols=()):
+        """
+        Deterministic automaton of the strings rejected by the automaton.
+
+        The complement is taken over the symbols of the automaton plus the
+        given ones. The subset construction already completes the
+        automaton with the "Empty" sink, which becomes final.
+
+        Args:
+            symbols: Extra symbols of the alphabet. Type: Iterable[str]
+
+        Returns:
+            Complement automaton. Type: FiniteAutomaton
+
+        """
+        automaton = FiniteAutomaton(
             initial_state=self.initial_state,
+            states=self.states,
+            symbols=tuple(dict.fromkeys((*self.symbols, *symbols))),
+            transitions=self.transitions,
+            final_states=self.final_states
+        )
+        aut_aux = automaton.to_deterministic()
+        aut_aux.final_states = set(aut_aux.states) - aut_aux.final_states
+        return aut_aux
+
+    def _deterministic_table(self):
+        # Tabla compilada; si el autómata no es determinista se determiniza antes
+        if self._is_deterministic():
+            return self.compile()
+        return self.to_deterministic().compile()
+
+    def _product(self, other, accept):
+        # Construcción producto perezosa: solo se crean los pares de estados
+        # alcanzables desde el par inicial. Una transición que falta lleva al
+        # sumidero (-1) de ese autómata; el par de sumideros es "Empty".
+        left = self._deterministic_table()
+        right = other._deterministic_table()
+        symbols = tuple(dict.fromkeys((*left.symbols, *right.symbols)))
+        left_columns = [left.symbol_index.get(symbol) for symbol in symbols]
+        right_columns = [right.symbol_index.get(symbol) for symbol in symbols]
+
+        aut_aux = FiniteAutomaton(
+            initial_state="",
             states=set(),
-            symbols=self.symbols,
+            symbols=symbols,
             transitions={},
             final_states=set()
         )
 
-        # Quitar estados inalcanzables
-        reachable = set()
-        queue = deque()
+        ids = {}
+        names = []
+
+        def get_id(pair):
+            state_id = ids.get(pair)
+            if state_id is None:
+                state_id = ids[pair] = len(names)
+                name = "Empty" if pair == (-1, -1) else f"q{state_id}"
+                names.append(name)
+                aut_aux.states.add(name)
+                left_state, right_state = pair
+                if accept(
+                    left_state >= 0 and left.final[left_state] == 1,
+                    right_state >= 0 and right.final[right_state] == 1,
+                ):
+                    aut_aux.final_states.add(name)
+                pending.append(pair)
+            return state_id
+
+        pending = deque()
+        aut_aux.initial_state = names[get_id((left.initial, right.initial))]
+
+        offsets = array('I', [0])
+        edge_symbols = array('I')
+        edge_targets = array('I')
+        while pending:
+            left_state, right_state = pending.popleft()
+            left_row = left_state * left.n_symbols
+            right_row = right_state * right.n_symbols
+            for symbol_id in range(len(symbols)):
+                left_column = left_columns[symbol_id]
+                right_column = right_columns[symbol_id]
+                left_target = -1 if left_state < 0 or left_column is None else left.table[left_row + left_column]
+                right_target = -1 if right_state < 0 or right_column is None else right.table[right_row + right_column]
+                edge_symbols.append(symbol_id)
+                edge_targets.append(get_id((left_target, right_target)))
+            offsets.append(len(edge_targets))
+
+        aut_aux.transitions = CompactTransitions(names, symbols, offsets, edge_symbols, edge_targets)
+        return aut_aux
+
+    def to_minimized(self, strategy="hopcroft", time_budget=None, labels=None):
+        # strategy: "hopcroft", "brzozowski" o "incremental" (unión-búsqueda que
+        # se puede interrumpir devolviendo un autómata parcialmente minimizado
+        # cuando han pasado time_budget segundos desde la llamada; la
+        # construcción del cociente posterior no se interrumpe).
+        # labels: etiqueta opcional por estado; solo se fusionan estados con
+        # la misma etiqueta
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        if strategy == "brzozowski":
+            if labels is not None:
+                raise ValueError("Brzozowski minimization does not support labels")
+            first = self._reverse()._determinize(self.final_states)
+            minimal = first._reverse()._determinize(first.final_states)
+            if not self._is_deterministic():
+                # Ya es mínimo; el cociente solo renombra los estados como las demás estrategias
+                return minimal.to_minimized()
+            compiled, order, delta, final = self._reachable_table()
+            blocks, block_of = self._residual_partition(compiled, delta, len(order), minimal)
+            return self._quotient(compiled, order, delta, final, blocks, block_of)
+
+        compiled, order, delta, final = self._reachable_table()
+        classes = final
+        if labels is not None:
+            classes = [
+                (final[state], None if old is None else labels.get(compiled.states[old]))
+                for state, old in enumerate(order)
+            ]
 
-        start_states = set({self.initial_state})
-        for s in start_states:
-            if s not in reachable:
-                reachable.add(s)
-                queue.append(s)
-                aut_aux.states.add(s)
-                if s in self.final_states:
-                    aut_aux.final_states.add(s)
+        if strategy == "hopcroft":
+            blocks, block_of = self._hopcroft_partition(compiled.n_symbols, delta, classes)
+        elif strategy == "incremental":
+            blocks, block_of = self._incremental_partition(
+                compiled.n_symbols, delta, classes, deadline)
+        else:
+            raise ValueError(f"Unknown strategy: {strategy}")
 
+        return self._quotient(compiled, order, delta, final, blocks, block_of)
+
+    def _reverse(self):
+        # Autómata con las transiciones invertidas; el estado inicial pasa a
+        # ser el único final (el nuevo inicial lo fija quien determiniza)
+        aut_aux = FiniteAutomaton(
+            initial_state=self.initial_state,
+            states=set(self.states),
+            symbols=self.symbols,
+            transitions={},
+            final_states={self.initial_state}
+        )
+        for state, symbol_transitions in self.transitions.items():
+            for symbol, targets in symbol_transitions.items():
+                for target in targets:
+                    aut_aux.transitions.setdefault(target, {}).setdefault(symbol, set()).add(state)
+        return aut_aux
+
+    def _reachable_table(self):
+        compiled = self.compile()
+        n_symbols = compiled.n_symbols
+
+        # Quitar estados inalcanzables (renumerando los alcanzables de 0 a n-1)
+        reachable = {compiled.initial: 0}
+        order = [compiled.initial]
+        queue = deque(order)
         while queue:
-            ss = queue.popleft()
-            for sym, targets in self.transitions.get(ss, {}).items():
-                for t in targets:
-                    aut_aux.add_transition(ss, sym, t)
-                    if t not in reachable:
-                        reachable.add(t)
-                        queue.append(t)
-                        aut_aux.states.add(t)
-                        if t in self.final_states:
-                            aut_aux.final_states.add(t)
-                    closure = set({t})
-                    for c in closure:
-                        if c not in reachable:
-                            reachable.add(c)
-                            queue.append(c)
-                            aut_aux.states.add(c)
-                            if c in self.final_states:
-                                aut_aux.final_states.add(c)
-
-        aut_aux.states = reachable
-
-        # Proceso de minimización
-        first_flag = False
-        idx_reference = -1
-        states = list(aut_aux.states)
-        i = 0
-        it1 = []
-        it2 = []
-        state_idx = {}
-        idx_state = {}
-        valid = False
-        
-        for idx, st in enumerate(states):
-            if st in aut_aux.get_final_states():
-                it1.append(1)
-            else:
-                it1.append(0)
-            it2.append(-1)
-            state_idx[st] = idx
-            idx_state[idx] = st
-        
-        while it1 != it2:
-            if i != 0:
-                it1 = it2.copy()
-                it2 = [-1 for _ in range(len(states))]
-                i=0
-            while -1 in it2:
-                idx_reference = -1
-                first_flag = False
-                for j, st in enumerate(states):
-                    if it2[j] == -1:
-                        if first_flag == False:
-                            first_flag = True
-                            it2[j] = i
-                            idx_reference = j
-                        else:
-                            if it1[j] != it1[idx_reference]:
-                                continue
-                            valid = True
-                            for sym in aut_aux.get_symbols():
-                                final_st1 = set()
-                                final_st2 = set()
-                                final_st1 = set(aut_aux.get_final_states_from_symbol_transitions(states[j], sym))
-                                final_st2 = set(aut_aux.get_final_states_from_symbol_transitions(states[idx_reference], sym))
-                                if it1[state_idx[final_st1.pop()]] != it1[state_idx[final_st2.pop()]]:
-                                    valid = False
-                                    break
-                            if valid:   
-                                it2[j] = i
-                i += 1
-
-        new_states = {}
-
-        # Cambio de nombre a los estados minimizados
-
-        for key in it2:
-            new_states[key] = set()
-
-        for idx, st in enumerate(states):
-            new_states[it2[idx]].add(st)
-
-        aut_aux2 = FiniteAutomaton(
+            old = queue.popleft()
+            for column in range(n_symbols):
+                target = compiled.table[old * n_symbols + column]
+                if target >= 0 and target not in reachable:
+                    reachable[target] = len(order)
+                    order.append(target)
+                    queue.append(target)
+
+        # Las transiciones que faltan van a un sumidero implícito (índice n),
+        # que solo se añade si hace falta
+        n = len(order)
+        sink = n
+        delta = [sink] * ((n + 1) * n_symbols)
+        for old, new in reachable.items():
+            for column in range(n_symbols):
+                target = compiled.table[old * n_symbols + column]
+                if target >= 0:
+                    delta[new * n_symbols + column] = reachable[target]
+        if sink in delta[:n * n_symbols]:
+            order.append(None)
+        else:
+            del delta[n * n_symbols:]
+
+        final = [state is not None and compiled.final[state] == 1 for state in order]
+        return compiled, order, delta, final
+
+    def _residual_partition(self, compiled, delta, n_total, minimal):
+        # Bloques de estados con el mismo residuo: se recorren a la vez la
+        # tabla delta y el autómata mínimo (todos los estados muertos de este
+        # se identifican con -1)
+        table = minimal.compile()
+        n_symbols = compiled.n_symbols
+        columns = [table.symbol_index.get(symbol) for symbol in compiled.symbols]
+
+        def residual(state):
+            return state if state >= 0 and table.live[state] else -1
+
+        residual_of = [None] * n_total
+        residual_of[0] = residual(table.initial)
+        queue = deque([0])
+        while queue:
+            state = queue.popleft()
+            current = residual_of[state]
+            for column in range(n_symbols):
+                target = delta[state * n_symbols + column]
+                if residual_of[target] is None:
+                    minimal_column = columns[column]
+                    if current < 0 or minimal_column is None:
+                        residual_of[target] = -1
+                    else:
+                        residual_of[target] = residual(table.table[current * table.n_symbols + minimal_column])
+                    queue.append(target)
+
+        blocks_by_residual = {}
+        for state in range(n_total):
+            blocks_by_residual.setdefault(residual_of[state], []).append(state)
+        blocks = list(blocks_by_residual.values())
+        block_of = [0] * n_total
+        for i, block in enumerate(blocks):
+            for state in block:
+                block_of[state] = i
+        return blocks, block_of
+
+    def _hopcroft_partition(self, n_symbols, delta, classes):
+        n_total = len(classes)
+
+        # Índice de transiciones inversas: inverse[column][estado] = predecesores
+        inverse = [[[] for _ in range(n_total)] for _ in range(n_symbols)]
+        for state in range(n_total):
+            for column in range(n_symbols):
+                inverse[column][delta[state * n_symbols + column]].append(state)
+
+        # Partición inicial: finales / no finales (o una clase por etiqueta)
+        blocks_by_class = {}
+        for state in range(n_total):
+            blocks_by_class.setdefault(classes[state], set()).add(state)
+        blocks = list(blocks_by_class.values())
+        block_of = [0] * n_total
+        for i, block in enumerate(blocks):
+            for state in block:
+                block_of[state] = i
+
+        # Refinamiento de Hopcroft con lista de bloques divisores pendientes
+        # (inicialmente todos menos el mayor)
+        largest = max(range(len(blocks)), key=lambda i: len(blocks[i]))
+        pending = [i for i in range(len(blocks)) if i != largest]
+        in_pending = [i != largest for i in range(len(blocks))]
+
+        while pending:
+            splitter = pending.pop()
+            in_pending[splitter] = False
+            splitter_states = list(blocks[splitter])
+            for column in range(n_symbols):
+                predecessors = set()
+                for state in splitter_states:
+                    predecessors.update(inverse[column][state])
+
+                touched = {}
+                for state in predecessors:
+                    touched.setdefault(block_of[state], []).append(state)
+
+                for block, members in touched.items():
+                    if len(members) == len(blocks[block]):
+                        continue
+                    new_block = len(blocks)
+                    blocks[block].difference_update(members)
+                    blocks.append(set(members))
+                    in_pending.append(False)
+                    for state in members:
+                        block_of[state] = new_block
+                    if in_pending[block] or len(members) <= len(blocks[block]):
+                        pending.append(new_block)
+                        in_pending[new_block] = True
+                    else:
+                        pending.append(block)
+                        in_pending[block] = True
+
+        return blocks, block_of
+
+    def _incremental_partition(self, n_symbols, delta, classes, deadline=None):
+        n_total = len(classes)
+        parent = list(range(n_total))
+
+        def find(state):
+            while parent[state] != state:
+                parent[state] = parent[parent[state]]
+                state = parent[state]
+            return state
+
+        def timed_out():
+            return deadline is not None and time.perf_counter() > deadline
+
+        # Pares ya comprobados como no equivalentes
+        distinct = set()
+
+        for p, q in combinations(range(n_total), 2):
+            if timed_out():
+                break
+            if classes[p] != classes[q]:
+                continue
+            p_root, q_root = find(p), find(q)
+            pair = (min(p_root, q_root), max(p_root, q_root))
+            if p_root == q_root or pair in distinct:
+                continue
+
+            # Recorrido de los pares alcanzables desde (p, q): si ninguno
+            # distingue finales de no finales, todos son equivalentes
+            visited = {pair}
+            queue = deque([pair])
+            equivalent = True
+            while queue and equivalent and not timed_out():
+                p_state, q_state = queue.popleft()
+                for column in range(n_symbols):
+                    p_next = find(delta[p_state * n_symbols + column])
+                    q_next = find(delta[q_state * n_symbols + column])
+                    if p_next == q_next:
+                        continue
+                    next_pair = (min(p_next, q_next), max(p_next, q_next))
+                    if classes[p_next] != classes[q_next] or next_pair in distinct:
+                        equivalent = False
+                        break
+                    if next_pair not in visited:
+                        visited.add(next_pair)
+                        queue.append(next_pair)
+
+            if not equivalent:
+                distinct.add(pair)
+            elif not queue:
+                for p_state, q_state in visited:
+                    parent[find(p_state)] = find(q_state)
+
+        blocks_by_root = {}
+        for state in range(n_total):
+            blocks_by_root.setdefault(find(state), set()).add(state)
+        blocks = list(blocks_by_root.values())
+        block_of = [0] * n_total
+        for i, block in enumerate(blocks):
+            for state in block:
+                block_of[state] = i
+        return blocks, block_of
+
+    def _quotient(self, compiled, order, delta, final, blocks, block_of):
+        # Construcción del autómata cociente (el bloque que solo contiene el
+        # sumidero implícito no se añade)
+        n_symbols = compiled.n_symbols
+        aut_aux = FiniteAutomaton(
             initial_state="",
             states=set(),
             symbols=self.symbols,
@@ -221,36 +1023,61 @@ class FiniteAutomaton:
             final_states=set()
         )
 
-        state_mapping = {}
-        for state_group in new_states.values():
-            new_name = ''.join(sorted(state_group))
-            state_mapping[new_name] = set(state_group)
+        # Cada bloque recibe un nombre "q<i>" según su posición (el inicial
+        # primero); los estados originales que agrupa quedan en _subsets, de
+        # modo que bloques distintos nunca comparten nombre
+        names = {}
+        representatives = {}
+        aut_aux._subsets = {}
+        initial_block = block_of[0]
+        for i in [initial_block] + [i for i in range(len(blocks)) if i != initial_block]:
+            members = [state for state in blocks[i] if order[state] is not None]
+            if members:
+                names[i] = name = f"q{len(names)}"
+                representatives[i] = members[0]
+                aut_aux._subsets[name] = frozenset(compiled.states[order[state]] for state in members)
+                aut_aux.states.add(name)
+                if final[members[0]]:
+                    aut_aux.final_states.add(name)
 
-            aut_aux2.states.add(new_name)
+        aut_aux.initial_state = names[initial_block]
 
-            if any(state == aut_aux.initial_state for state in state_group):
-                aut_aux2.initial_state = new_name
+        ids = {i: state_id for state_id, i in enumerate(names)}
+        offsets = array('I', [0])
+        edge_symbols = array('I')
+        targets = array('I')
+        for i in names:
+            state = representatives[i]
+            for column in range(n_symbols):
+                target_id = ids.get(block_of[delta[state * n_symbols + column]])
+                if target_id is not None:
+                    edge_symbols.append(column)
+                    targets.append(target_id)
+            offsets.append(len(targets))
+        aut_aux.transitions = CompactTransitions(
+            list(names.values()), compiled.symbols, offsets, edge_symbols, targets
+        )
+
+        return aut_aux
+        
+    def state_label(self, state):
+        """
+        Get a readable name of a state, built only when it is needed.
 
-            if any(state in aut_aux.get_final_states() for state in state_group):
-                aut_aux2.final_states.add(new_name)
+        States of determinized or minimized automata are named by their
+        position; their label lists the original states they stand for.
 
-        for sym in aut_aux.get_symbols():
-            for new_state_name, state_set in state_mapping.items():
-                all_targets = set()
-                for old_state in state_set:
-                    transitions = aut_aux.get_transitions_from_state(old_state)
-                    if transitions and sym in transitions:
-                        all_targets.update(transitions[sym])
+        Args:
+            state: State of the automaton. Type: str
 
-                if all_targets:
-                    for target_name, target_set in state_mapping.items():
-                        if all_targets.issubset(target_set):
-                            aut_aux2.add_transition(new_state_name, sym, target_name)
-                            break
+        Returns:
+            Label of the state. Type: str
 
+        """
+        if self._subsets is None or state not in self._subsets:
+            return state
+        return "{" + ",".join(sorted(self._subsets[state])) + "}"
 
-        return aut_aux2
-        
     def draw(self, path="./images/", filename="automata.png", view=False):
         dot = Digraph(comment="Automata", format="png")
         dot.attr(rankdir="LR")
@@ -261,9 +1088,9 @@ class FiniteAutomaton:
         # Almacenar estados
         for state in self.states:
             if state in self.final_states:
-                dot.node(state, shape="doublecircle")
+                dot.node(state, label=self.state_label(state), shape="doublecircle")
             else:
-                dot.node(state, shape="circle")
+                dot.node(state, label=self.state_label(state), shape="circle")
         
         # Flecha al estado inicial
         dot.edge("", self.initial_state)
@@ -277,18 +1104,120 @@ class FiniteAutomaton:
         dot.render(path+filename, view=view)
         
     def _lambda_check(self, states):
-        current_states = set(states)
-        queue = deque(states) 
-        
+        # Recorrido de las componentes alcanzables, marcando las visitadas:
+        # cuesta lo mismo que el cierre que se devuelve
+        component_of, members, successors = self._lambda_components()
+        current_states = set()
+        visited = set()
+        for state in states:
+            component = component_of.get(state)
+            if component is None:
+                current_states.add(state)
+                continue
+            if component in visited:
+                continue
+            visited.add(component)
+            pending = [component]
+            while pending:
+                component = pending.pop()
+                current_states.update(members[component])
+                for next_component in successors[component]:
+                    if next_component not in visited:
+                        visited.add(next_component)
+                        pending.append(next_component)
+        return current_states
+
+    def _lambda_components(self):
+        if self._components is None:
+            self._components = self._compute_lambda_components()
+        return self._components
+
+    def _compute_lambda_components(self):
+        # Condensación del grafo de transiciones lambda (Tarjan iterativo):
+        # componente de cada estado, estados de cada componente y componentes
+        # sucesoras. Tarjan cierra las componentes en orden topológico inverso,
+        # así que las sucesoras de una componente tienen un número menor.
+        # Los estados sin transiciones lambda de entrada ni de salida no
+        # aparecen: su cierre es él mismo.
+        lambda_edges = {
+            state: symbol_transitions[None]
+            for state, symbol_transitions in self.transitions.items()
+            if symbol_transitions.get(None)
+        }
+        component_of = {}
+        members = []
+        successors = []
+        index = {}
+        low = {}
+        stack = []
+        on_stack = set()
+
+        for root in lambda_edges:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(lambda_edges[root]))]
+
+            while work:
+                state, next_states = work[-1]
+                for next_state in next_states:
+                    if next_state not in index:
+                        index[next_state] = low[next_state] = len(index)
+                        stack.append(next_state)
+                        on_stack.add(next_state)
+                        work.append((next_state, iter(lambda_edges.get(next_state, ()))))
+                        break
+                    if next_state in on_stack:
+                        low[state] = min(low[state], index[next_state])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[state])
+                    if low[state] != index[state]:
+                        continue
+
+                    # Componente completa: sus sucesoras ya están numeradas
+                    component = len(members)
+                    component_members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component_of[member] = component
+                        component_members.append(member)
+                        if member == state:
+                            break
+                    next_components = set()
+                    for member in component_members:
+                        for next_state in lambda_edges.get(member, ()):
+                            next_component = component_of[next_state]
+                            if next_component != component:
+                                next_components.add(next_component)
+                    members.append(tuple(component_members))
+                    successors.append(tuple(next_components))
+
+        return component_of, members, successors
+
+    def _coreachable_states(self):
+        # Estados desde los que se alcanza algún final (búsqueda hacia atrás)
+        predecessors = {}
+        for state, symbol_transitions in self.transitions.items():
+            for targets in symbol_transitions.values():
+                for target in targets:
+                    predecessors.setdefault(target, []).append(state)
+
+        coreachable = set(self.final_states)
+        queue = deque(coreachable)
         while queue:
             state = queue.popleft()
-            if state in self.transitions and None in self.transitions[state]:
-                for next_state in self.transitions[state][None]:
-                    if next_state not in current_states:
-                        current_states.add(next_state)
-                        queue.append(next_state)
-        return current_states
-    
+            for previous in predecessors.get(state, ()):
+                if previous not in coreachable:
+                    coreachable.add(previous)
+                    queue.append(previous)
+        return coreachable
+
     def get_states(self):
         return self.states
     
@@ -310,6 +1239,5 @@ class FiniteAutomaton:
         return self.transitions[state]
     
     def get_final_states_from_symbol_transitions(self, state, symbol):
-        if state in self.transitions and symbol in self.transitions[state]:
-            return self.transitions[state][symbol]
-        return set()
\ No newline at end of file
+        # Una sola búsqueda por nivel (las filas compactas se crean al acceder)
+        return self.transitions.get(state, {}).get(symbol, set())
\ No newline at end of file
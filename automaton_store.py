@@ -0,0 +1,163 @@
+"""Persistent on-disk cache of compiled automata."""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+from automaton import CompiledAutomaton
+from re_parser import REParser
+
+MAGIC = b"AUTL"
+# Se incrementa con cualquier cambio del formato o de la construcción de
+# autómatas; las entradas con otra versión se descartan
+FORMAT_VERSION = 1
+
+# magic, version, little endian, states, symbols, initial, symbols length
+_HEADER = struct.Struct("<4sIIIIII")
+
+
+def save_compiled(compiled, path):
+    """
+    Write a compiled automaton in the binary format.
+
+    The file has a header, the symbol table (JSON), the transition table
+    (``int32``, native byte order, 4-byte aligned) and one byte per state
+    for the final and live flags. It is written to a temporary file and
+    then renamed, so readers never see a partial file.
+
+    Args:
+        compiled: Automaton to write. Type: CompiledAutomaton
+        path: Destination path. Type: str
+
+    """
+    n_states = len(compiled.final)
+    symbols = json.dumps(list(compiled.symbols)).encode("utf-8")
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, sys.byteorder == "little",
+        n_states, compiled.n_symbols, compiled.initial, len(symbols),
+    )
+    padding = -(len(header) + len(symbols)) % 4
+
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(header)
+            file.write(symbols)
+            file.write(b"\0" * padding)
+            file.write(array('i', compiled.table).tobytes())
+            file.write(bytes(compiled.final))
+            file.write(bytes(compiled.live))
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+def load_compiled(path):
+    """
+    Map a compiled automaton written by ``save_compiled``.
+
+    The transition table and the flags are memory views over the mapped
+    file, so nothing is copied. Files with another format version, byte
+    order or an invalid layout are removed.
+
+    Args:
+        path: Path of the file. Type: str
+
+    Returns:
+        Compiled automaton, or ``None`` if the file is missing or stale.
+        Type: Optional[CompiledAutomaton]
+
+    """
+    try:
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    view = memoryview(buffer)
+    try:
+        magic, version, little, n_states, n_symbols, initial, symbols_length = \
+            _HEADER.unpack_from(view)
+        if magic != MAGIC or version != FORMAT_VERSION or little != (sys.byteorder == "little"):
+            raise ValueError("Stale automaton file")
+
+        offset = _HEADER.size
+        symbols = json.loads(bytes(view[offset:offset + symbols_length]).decode("utf-8"))
+        offset += symbols_length
+        offset += -offset % 4
+
+        table_size = 4 * n_states * n_symbols
+        if len(view) != offset + table_size + 2 * n_states:
+            raise ValueError("Truncated automaton file")
+        table = view[offset:offset + table_size].cast('i')
+        offset += table_size
+        final = view[offset:offset + n_states]
+        live = view[offset + n_states:offset + 2 * n_states]
+    except (struct.error, ValueError, UnicodeDecodeError):
+        view.release()
+        buffer.close()
+        os.remove(path)
+        return None
+
+    compiled = CompiledAutomaton.from_buffers(symbols, table, final, live, initial)
+    compiled._buffer = buffer
+    return compiled
+
+
+class AutomatonStore():
+    """
+    Directory of compiled minimal automata of regexes.
+
+    Each entry is named after a hash of the format version, the
+    construction mode and the regex, so a warm start only maps the file.
+    """
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory: Cache directory (created if needed). Type: str
+
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, re_string, mode="thompson"):
+        """
+        Get the path of the entry of a regex.
+
+        Args:
+            re_string: Regular expression in Kleene's syntax. Type: str
+            mode: Construction mode of ``REParser``. Type: str
+
+        Returns:
+            Path of the entry. Type: str
+
+        """
+        key = f"{FORMAT_VERSION}\0{mode}\0{re_string}".encode("utf-8")
+        return os.path.join(self.directory, hashlib.sha256(key).hexdigest() + ".autl")
+
+    def get(self, re_string, mode="thompson"):
+        """
+        Load the compiled automaton of a regex, building it if needed.
+
+        Args:
+            re_string: Regular expression in Kleene's syntax. Type: str
+            mode: Construction mode of ``REParser``. Type: str
+
+        Returns:
+            Compiled minimal automaton of the regex. Type: CompiledAutomaton
+
+        """
+        path = self.path(re_string, mode)
+        compiled = load_compiled(path)
+        if compiled is None:
+            automaton = REParser(mode=mode).create_automaton(re_string)
+            compiled = automaton.to_deterministic().to_minimized().compile()
+            save_compiled(compiled, path)
+        return compiled
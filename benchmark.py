@@ -0,0 +1,591 @@
+"""Benchmarks for the automata algorithms.
+
+Run with ``python benchmark.py [name ...]``; without arguments every
+benchmark is executed.
+"""
+import copy
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from automaton import CompactTransitions, FiniteAutomaton
+from re_parser import REParser, _re_to_rpn
+from utils import (
+    AutomataFormat, FormatParseError, antichain_included,
+    deterministic_automata_isomorphism, equivalent, included,
+)
+
+
+def _timeit(function, *args):
+    """
+    Run a function once and measure it.
+
+    Args:
+        function: Function to call.
+        args: Positional arguments of the call.
+
+    Returns:
+        Tuple with the elapsed seconds and the result of the call.
+
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def nth_from_last_regex(n):
+    """
+    Regex of the strings over {a, b} whose n-th symbol from the end is an a.
+
+    Its deterministic automaton has 2**n states.
+
+    Args:
+        n: Position counted from the end. Type: int
+
+    Returns:
+        Regular expression in Kleene's syntax. Type: str
+
+    """
+    return "(a+b)*.a" + ".(a+b)" * (n - 1)
+
+
+def bench_to_deterministic(sizes=(10, 12, 14)):
+    """Measure the subset construction on regexes with exponential DFAs."""
+    for n in sizes:
+        nfa = REParser().create_automaton(nth_from_last_regex(n))
+        elapsed, dfa = _timeit(nfa.to_deterministic)
+        print(
+            f"to_deterministic n={n}: {len(dfa.states)} DFA states "
+            f"from {len(nfa.states)} NFA states in {elapsed:.3f}s"
+        )
+
+
+def random_dfa(n_states, symbols="ab", final_ratio=0.5, seed=0):
+    """
+    Create a random complete deterministic automaton.
+
+    Args:
+        n_states: Number of states. Type: int
+        symbols: Alphabet of the automaton. Type: str
+        final_ratio: Probability of a state being final. Type: float
+        seed: Seed of the random generator. Type: int
+
+    Returns:
+        Random deterministic automaton. Type: FiniteAutomaton
+
+    """
+    rng = random.Random(seed)
+    states = [f"q{i}" for i in range(n_states)]
+    transitions = {
+        state: {symbol: {rng.choice(states)} for symbol in symbols}
+        for state in states
+    }
+    final_states = {state for state in states if rng.random() < final_ratio}
+    return FiniteAutomaton(states[0], states, tuple(symbols), transitions, final_states)
+
+
+def bench_to_minimized(sizes=(10**3, 10**4, 10**5)):
+    """Measure the minimization of random deterministic automata."""
+    for n in sizes:
+        dfa = random_dfa(n)
+        elapsed, minimized = _timeit(dfa.to_minimized)
+        print(
+            f"to_minimized n={n}: {len(minimized.states)} states "
+            f"in {elapsed:.3f}s"
+        )
+
+
+def bench_minimization_strategies(sizes=(8, 10, 12)):
+    """Compare determinize-then-minimize with Brzozowski on regex automata."""
+    for n in sizes:
+        nfa = REParser().create_automaton(nth_from_last_regex(n))
+        elapsed_hopcroft, _ = _timeit(lambda: nfa.to_deterministic().to_minimized())
+        elapsed_brzozowski, minimized = _timeit(nfa.to_minimized, "brzozowski")
+        print(
+            f"minimization n={n}: {len(minimized.states)} states, "
+            f"hopcroft {elapsed_hopcroft:.3f}s, brzozowski {elapsed_brzozowski:.3f}s"
+        )
+
+
+def balanced_regex(n_symbols, symbols="ab"):
+    """
+    Regex with a given number of symbols as a balanced tree of operators.
+
+    Args:
+        n_symbols: Number of symbols of the regex. Type: int
+        symbols: Symbols used in the leaves. Type: str
+
+    Returns:
+        Regular expression in Kleene's syntax. Type: str
+
+    """
+    def build(first, count):
+        if count == 1:
+            return symbols[first % len(symbols)]
+        half = count // 2
+        operator = "." if count % 3 else "+"
+        left = build(first, half)
+        right = build(first + half, count - half)
+        return f"({left}{operator}{right})"
+
+    return build(0, n_symbols) + "*"
+
+
+class _PreviousREParser():
+    """Previous construction of automata from regexes, kept for comparison.
+
+    Leaves are parsed from a text description with the previous reader and
+    operators combine whole automata, renaming their states.
+    """
+
+    def __init__(self) -> None:
+        self.state_counter = 0
+
+    def _create_automaton_empty(self):
+        description = """
+        Automaton:
+            Symbols: 
+
+            q0
+
+            ini q0
+        """
+
+        return _PreviousAutomataFormat.read(description)
+
+
+    def _create_automaton_lambda(self):
+        description = """
+        Automaton:
+            Symbols: 
+
+            q0 final
+
+            ini q0
+        """
+        return _PreviousAutomataFormat.read(description)
+
+    def _create_automaton_symbol(self, symbol):
+        description = f"""
+        Automaton:
+            Symbols: {symbol}
+
+            q0
+            q1 final
+
+            ini q0 -{symbol}-> q1
+        """
+        return _PreviousAutomataFormat.read(description)
+
+    def _create_automaton_star(self, automaton):
+        empty_initial = f"Empty_initial_{self.state_counter}"
+        empty_final = f"Empty_final_{self.state_counter}"
+        self.state_counter += 1
+
+        # Copiar transiciones para no compartir referencia con el autómata original
+        copied_transitions = copy.deepcopy(automaton.get_transitions())
+
+        kleene_automaton = FiniteAutomaton(
+            initial_state = empty_initial,
+            states = automaton.get_states() + [empty_initial, empty_final],
+            symbols = automaton.get_symbols(),
+            transitions = copied_transitions,
+            final_states = {empty_final}
+        )
+
+        # Transiciones lambda (usar None en lugar de "λ")
+        # 1. Desde empty_initial al estado inicial del autómata
+        kleene_automaton.add_transition(empty_initial, None, automaton.get_initial_state())
+
+        # 2. Desde empty_initial directamente a empty_final (para aceptar cadena vacía)
+        kleene_automaton.add_transition(empty_initial, None, empty_final)
+
+        # 3. Desde estados finales del autómata a empty_final
+        for final_state in automaton.get_final_states():
+            kleene_automaton.add_transition(final_state, None, empty_final)
+
+        # 4. Desde estados finales del autómata de vuelta al inicio (para repetir)
+        for final_state in automaton.get_final_states():
+            kleene_automaton.add_transition(final_state, None, automaton.get_initial_state())
+
+        return kleene_automaton
+
+    def _create_automaton_union(self, automaton1, automaton2):
+        empty_initial = f"Empty_initial_{self.state_counter}"
+        empty_final = f"Empty_final_{self.state_counter}"
+        self.state_counter += 1
+
+        # Renombrar estados de automaton1
+        automaton1state_transfer = {}
+        for state in automaton1.get_states():
+            automaton1state_transfer[state] = "q" + str(self.state_counter)
+            self.state_counter += 1
+        automaton1states = list(automaton1state_transfer.values())
+
+        # Renombrar transiciones de automaton1
+        automaton1transitions = {}
+        for ss, dct in automaton1.get_transitions().items():
+            n_ss = automaton1state_transfer[ss]
+            automaton1transitions[n_ss] = {}  # ← Inicializar diccionario para este estado
+            for k, v in dct.items():
+                n_v = set()
+                for state in v:
+                    n_v.add(automaton1state_transfer[state])
+                automaton1transitions[n_ss][k] = n_v  # ← Guardar cada símbolo correctamente
+
+        # Renombrar estados de automaton2
+        automaton2state_transfer = {}
+        for state in automaton2.get_states():
+            automaton2state_transfer[state] = "q" + str(self.state_counter)
+            self.state_counter += 1
+        automaton2states = list(automaton2state_transfer.values())
+
+        # Renombrar transiciones de automaton2
+        automaton2transitions = {}
+        for ss, dct in automaton2.get_transitions().items():
+            n_ss = automaton2state_transfer[ss]
+            automaton2transitions[n_ss] = {}  # ← Inicializar diccionario para este estado
+            for k, v in dct.items():
+                n_v = set()
+                for state in v:
+                    n_v.add(automaton2state_transfer[state])
+                automaton2transitions[n_ss][k] = n_v  # ← Guardar cada símbolo correctamente
+
+        # Crear autómata unión
+        union_automaton = FiniteAutomaton(
+            initial_state = empty_initial,
+            states = automaton1states + automaton2states + [empty_final, empty_initial],
+            symbols = automaton1.get_symbols() + automaton2.get_symbols(),
+            transitions = automaton1transitions | automaton2transitions,
+            final_states = {empty_final}
+        )
+
+        # Conectar empty_initial con ambos autómatas (bifurcación)
+        union_automaton.add_transition(empty_initial, None, automaton1state_transfer[automaton1.get_initial_state()])
+        union_automaton.add_transition(empty_initial, None, automaton2state_transfer[automaton2.get_initial_state()])
+
+        # Conectar estados finales de automaton1 con empty_final
+        for final_state in automaton1.get_final_states():
+            renamed_final = automaton1state_transfer[final_state]  # ← Usar nombre renombrado
+            union_automaton.add_transition(renamed_final, None, empty_final)
+
+        # Conectar estados finales de automaton2 con empty_final
+        for final_state in automaton2.get_final_states():
+            renamed_final = automaton2state_transfer[final_state]  # ← Usar nombre renombrado
+            union_automaton.add_transition(renamed_final, None, empty_final)
+
+        return union_automaton
+
+    def _create_automaton_concat(self, automaton1, automaton2):
+        empty_initial = f"Empty_initial_{self.state_counter}"
+        empty_final = f"Empty_final_{self.state_counter}"
+        self.state_counter += 1
+
+        # Obtener mapeos de estados antiguos->nuevos y listas de estados
+        automaton1state_transfer = self._change_state_names(automaton1)
+        automaton2state_transfer = self._change_state_names(automaton2)
+        automaton1states = list(automaton1state_transfer.values())
+        automaton2states = list(automaton2state_transfer.values())
+
+        # Renombrar transiciones usando los mapeos
+        automaton1transitions = self._change_transition_names(automaton1, automaton1state_transfer)
+        automaton2transitions = self._change_transition_names(automaton2, automaton2state_transfer)
+
+        # Crear autómata concatenado
+        concat_automaton = FiniteAutomaton(
+            initial_state = empty_initial,
+            states = automaton1states + automaton2states + [empty_final, empty_initial],
+            symbols = automaton1.get_symbols() + automaton2.get_symbols(),
+            transitions = automaton1transitions | automaton2transitions,
+            final_states = {empty_final}
+        )
+
+        # Conectar empty_initial con el inicio de automaton1
+        concat_automaton.add_transition(empty_initial, None, automaton1state_transfer[automaton1.get_initial_state()])
+
+        # Conectar estados finales de automaton1 con el inicio de automaton2
+        for final_state in automaton1.get_final_states():
+            renamed_final = automaton1state_transfer[final_state]  # ← Usar nombre renombrado
+            concat_automaton.add_transition(renamed_final, None, automaton2state_transfer[automaton2.get_initial_state()])
+
+        # Conectar estados finales de automaton2 con empty_final
+        for final_state in automaton2.get_final_states():
+            renamed_final = automaton2state_transfer[final_state]  # ← Usar nombre renombrado
+            concat_automaton.add_transition(renamed_final, None, empty_final)
+
+
+        return concat_automaton
+
+    def create_automaton(
+        self,
+        re_string,
+    ):
+        if not re_string:
+            return self._create_automaton_empty()
+
+        rpn_string = _re_to_rpn(re_string)
+
+        stack = [] # list of FiniteAutomatons
+
+        self.state_counter = 0
+        for x in rpn_string:
+            if x == "*":
+                aut = stack.pop()
+                stack.append(self._create_automaton_star(aut))
+            elif x == "+":
+                aut2 = stack.pop()
+                aut1 = stack.pop()
+                stack.append(self._create_automaton_union(aut1, aut2))
+            elif x == ".":
+                aut2 = stack.pop()
+                aut1 = stack.pop()
+                stack.append(self._create_automaton_concat(aut1, aut2))
+            elif x == "λ":
+                stack.append(self._create_automaton_lambda())
+            else:
+                stack.append(self._create_automaton_symbol(x))
+
+        return stack.pop()
+
+    def _change_state_names(self, automaton):
+        state_transfer = {}
+        for state in automaton.get_states():
+            state_transfer[state] = "q" + str(self.state_counter)
+            self.state_counter += 1
+
+        return state_transfer
+
+    def _change_transition_names(self, automaton, state_transfer):
+        transitions = {}
+        for ss, dct in automaton.get_transitions().items():
+            n_ss = state_transfer[ss]
+            transitions[n_ss] = {}
+            for k, v in dct.items():
+                n_v = set()
+                for state in v:
+                    n_v.add(state_transfer[state])
+                transitions[n_ss][k] = n_v
+
+        return transitions
+
+
+def bench_create_automaton(sizes=(10**3, 10**4)):
+    """Compare the previous and the current construction of regex automata."""
+    for n in sizes:
+        regex = balanced_regex(n)
+        elapsed_old, _ = _timeit(_PreviousREParser().create_automaton, regex)
+        elapsed_new, automaton = _timeit(REParser().create_automaton, regex)
+        print(
+            f"create_automaton {n} symbols: {len(automaton.states)} states, "
+            f"previous {elapsed_old:.3f}s, current {elapsed_new:.3f}s"
+        )
+
+
+def bench_glushkov(sizes=(10, 12, 14)):
+    """Compare determinization of Thompson and Glushkov automata."""
+    for n in sizes:
+        regex = nth_from_last_regex(n)
+        for mode in ("thompson", "glushkov"):
+            nfa = REParser(mode=mode).create_automaton(regex)
+            elapsed, dfa = _timeit(nfa.to_deterministic)
+            print(
+                f"{mode} n={n}: {len(nfa.states)} NFA states, "
+                f"{len(dfa.states)} DFA states in {elapsed:.3f}s"
+            )
+
+
+class _PreviousAutomataFormat():
+    """Previous reader of the text format: one regex per kind of line."""
+
+    re_comment = re.compile(r"\s*#\.*")
+    re_empty = re.compile(r"\s*")
+    re_automaton = re.compile(r"\s*Automaton:\s*")
+    re_state = re.compile(r"\s*(\w+)(?:\s*(final))?\s*")
+    re_transition = re.compile(r"\s*(\w+)\s*-(\S)?->\s*(\w+)\s*")
+    re_initial = re.compile(r"\s*ini\s(\w+)\s*-(\S)?->\s*(\w+)\s*")
+    re_symbols = re.compile(r"\s*Symbols:\s*(\S*)\s*")
+
+    @classmethod
+    def read(cls, description):
+        prelude_read = False
+        states = []
+        final_states = set()
+        automata = FiniteAutomaton("", [], set(), {}, set())
+
+        for line in description.splitlines():
+            if cls.re_comment.fullmatch(line) or cls.re_empty.fullmatch(line):
+                continue
+            if prelude_read:
+                match = cls.re_symbols.fullmatch(line)
+                if match:
+                    symbols = tuple(match.groups()[0])
+                    continue
+                match = cls.re_state.fullmatch(line)
+                if match:
+                    state_name, final_text = match.groups()
+                    states.append(state_name)
+                    if final_text:
+                        final_states.add(state_name)
+                    continue
+                match = cls.re_initial.fullmatch(line)
+                if match:
+                    initial_state = match.groups()[0]
+                    line = line.replace('ini ', '')
+                match = cls.re_transition.fullmatch(line)
+                if match:
+                    automata.add_transition(*match.groups())
+                    continue
+            elif cls.re_automaton.fullmatch(line):
+                prelude_read = True
+                continue
+            raise FormatParseError(f"Invalid line: {line}")
+
+        automata.initial_state = initial_state
+        automata.symbols = symbols
+        automata.states = states
+        automata.final_states = final_states
+        return automata
+
+
+def automaton_description(automaton):
+    """
+    Write an automaton in the text format read by ``AutomataFormat``.
+
+    Args:
+        automaton: Automaton to write. Type: FiniteAutomaton
+
+    Returns:
+        Lines of the description. Type: Iterator[str]
+
+    """
+    yield "Automaton:\n"
+    yield f"    Symbols: {''.join(automaton.symbols)}\n"
+    for state in automaton.states:
+        yield f"    {state} final\n" if state in automaton.final_states else f"    {state}\n"
+    for state, symbol_transitions in automaton.transitions.items():
+        prefix = "ini " if state == automaton.initial_state else ""
+        for symbol, targets in symbol_transitions.items():
+            for target in targets:
+                yield f"    {prefix}{state} -{symbol or ''}-> {target}\n"
+
+
+def bench_read(sizes=(10**5, 10**6)):
+    """Compare the previous and the streaming reader of the text format."""
+    for n in sizes:
+        dfa = random_dfa(n // 2)
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as file:
+            file.writelines(automaton_description(dfa))
+        try:
+            with open(file.name) as description:
+                elapsed_old, _ = _timeit(lambda: _PreviousAutomataFormat.read(description.read()))
+            with open(file.name) as description:
+                elapsed_new, automaton = _timeit(AutomataFormat.read, description)
+        finally:
+            os.remove(file.name)
+        print(
+            f"read {n} transitions, {len(automaton.states)} states: "
+            f"previous {elapsed_old:.3f}s, streaming {elapsed_new:.3f}s"
+        )
+
+
+def _traced(function, *args):
+    """
+    Run a function and measure the memory still allocated by its result.
+
+    Args:
+        function: Function to call.
+        args: Positional arguments of the call.
+
+    Returns:
+        Tuple with the allocated bytes and the result of the call.
+
+    """
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return allocated, result
+
+
+def bench_memory(sizes=(10**4, 10**5)):
+    """Compare the memory of dict and compact (CSR) transitions."""
+    for n in sizes:
+        dfa = random_dfa(n)
+        dict_bytes, transitions = _traced(lambda: {
+            state: {symbol: set(targets) for symbol, targets in row.items()}
+            for state, row in dfa.transitions.items()
+        })
+        compact_bytes, _ = _traced(CompactTransitions.from_dict, transitions)
+        print(
+            f"transitions n={n}: dict {dict_bytes / 2**20:.1f} MiB, "
+            f"compact {compact_bytes / 2**20:.1f} MiB"
+        )
+
+    nfa = REParser().create_automaton(nth_from_last_regex(14))
+    allocated, deterministic = _traced(nfa.to_deterministic)
+    print(
+        f"to_deterministic {len(deterministic.states)} states: "
+        f"{allocated / 2**20:.1f} MiB in total, transitions "
+        f"{_traced(CompactTransitions.from_dict, deterministic.transitions)[0] / 2**20:.1f} MiB, "
+        f"as dicts {_traced(deterministic.transitions.to_dict)[0] / 2**20:.1f} MiB"
+    )
+
+
+def bench_equivalence(sizes=(8, 10, 12)):
+    """Compare minimization plus isomorphism with Hopcroft-Karp equivalence."""
+    for n in sizes:
+        nfa1 = REParser().create_automaton(nth_from_last_regex(n))
+        nfa2 = REParser().create_automaton("(a*.b*)*.a" + ".(b+a)" * (n - 1))
+
+        def minimize_and_compare():
+            minimized1 = nfa1.to_deterministic().to_minimized()
+            minimized2 = nfa2.to_deterministic().to_minimized()
+            return deterministic_automata_isomorphism(minimized1, minimized2) is not None
+
+        elapsed_minimized, same = _timeit(minimize_and_compare)
+        elapsed_equivalent, (is_equivalent, _) = _timeit(equivalent, nfa1, nfa2)
+        assert same and is_equivalent
+        print(
+            f"equivalence n={n}: minimize and compare {elapsed_minimized:.3f}s, "
+            f"hopcroft-karp {elapsed_equivalent:.3f}s"
+        )
+
+
+def bench_antichain(sizes=(10, 12, 14)):
+    """Compare Hopcroft-Karp and antichain inclusion on exponential NFAs."""
+    for n in sizes:
+        nfa1 = REParser().create_automaton(nth_from_last_regex(n))
+        nfa2 = REParser().create_automaton("(b+a)*.a" + ".(b+a)" * (n - 1))
+        elapsed_included, _ = _timeit(included, nfa1, nfa2)
+        elapsed_antichain, (_, _, explored) = _timeit(antichain_included, nfa1, nfa2)
+        elapsed_simulation, (_, _, explored_simulation) = _timeit(
+            lambda: antichain_included(nfa1, nfa2, simulation=True))
+        print(
+            f"inclusion n={n}: hopcroft-karp {elapsed_included:.3f}s, "
+            f"antichain {elapsed_antichain:.3f}s ({explored} pairs), "
+            f"with simulation {elapsed_simulation:.3f}s ({explored_simulation} pairs)"
+        )
+
+
+BENCHMARKS = {
+    "to_deterministic": bench_to_deterministic,
+    "to_minimized": bench_to_minimized,
+    "minimization_strategies": bench_minimization_strategies,
+    "create_automaton": bench_create_automaton,
+    "glushkov": bench_glushkov,
+    "read": bench_read,
+    "memory": bench_memory,
+    "equivalence": bench_equivalence,
+    "antichain": bench_antichain,
+}
+
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
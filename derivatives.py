@@ -0,0 +1,340 @@
+"""Regex matching with Brzozowski derivatives."""
+from collections import OrderedDict, deque
+
+from automaton import FiniteAutomaton
+from re_parser import _re_to_rpn
+
+# Tipos de término
+EMPTY = "empty"
+LAMBDA = "lambda"
+SYMBOL = "symbol"
+UNION = "union"
+CONCAT = "concat"
+STAR = "star"
+
+
+class DerivativeMatcher():
+    """
+    Matcher of a regex in Kleene's syntax using Brzozowski derivatives.
+
+    Regex terms are hash-consed (each distinct simplified term is a small
+    integer) and simplified modulo associativity, commutativity and
+    idempotence of the union, so every term has finitely many distinct
+    derivatives. Derivatives are memoized in a bounded LRU cache keyed by
+    ``(term, symbol)``; the cached entries are the transitions of a
+    deterministic automaton built lazily while strings are evaluated,
+    which can be exported with ``to_automaton``.
+    """
+
+    def __init__(self, re_string, max_cache=10000):
+        """
+        Args:
+            re_string: Regular expression in Kleene's syntax. Type: str
+            max_cache: Maximum number of cached derivatives. Type: int
+
+        """
+        self.max_cache = max_cache
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self.terms = [] # term id -> (kind, *args)
+        self.term_ids = {}
+        self.nullable = []
+
+        self.empty = self._intern((EMPTY,))
+        self.lambda_ = self._intern((LAMBDA,))
+        self.symbols = tuple(dict.fromkeys(
+            x for x in re_string if x not in "+.*()λ"
+        ))
+        self.initial = self._parse(re_string)
+
+    def _intern(self, term):
+        """
+        Get the identifier of a term, creating it if it is new.
+
+        Args:
+            term: Simplified term as a tuple ``(kind, *args)``. Type: tuple
+
+        Returns:
+            Identifier of the term. Type: int
+
+        """
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            self.terms.append(term)
+            self.term_ids[term] = term_id
+            kind = term[0]
+            if kind in (LAMBDA, STAR):
+                nullable = True
+            elif kind == UNION:
+                nullable = any(self.nullable[t] for t in term[1])
+            elif kind == CONCAT:
+                nullable = self.nullable[term[1]] and self.nullable[term[2]]
+            else:
+                nullable = False
+            self.nullable.append(nullable)
+        return term_id
+
+    def _symbol(self, symbol):
+        return self._intern((SYMBOL, symbol))
+
+    def _union(self, *term_ids):
+        # Unión simplificada: se aplana, se quita el vacío y se ignora el orden
+        members = set()
+        for term_id in term_ids:
+            term = self.terms[term_id]
+            if term[0] == UNION:
+                members |= term[1]
+            elif term[0] != EMPTY:
+                members.add(term_id)
+        if not members:
+            return self.empty
+        if len(members) == 1:
+            return next(iter(members))
+        return self._intern((UNION, frozenset(members)))
+
+    def _concat(self, left, right):
+        # Concatenación simplificada y asociada a la derecha
+        if left == self.empty or right == self.empty:
+            return self.empty
+        return self._concat_factors(self._factors(left) + [right])
+
+    def _factors(self, term_id):
+        """
+        Split a term in the factors of its concatenation.
+
+        Args:
+            term_id: Identifier of the term. Type: int
+
+        Returns:
+            Factors, none of them a concatenation. Type: List[int]
+
+        """
+        factors = []
+        while self.terms[term_id][0] == CONCAT:
+            factors.append(self.terms[term_id][1])
+            term_id = self.terms[term_id][2]
+        factors.append(term_id)
+        return factors
+
+    def _concat_factors(self, factors):
+        """
+        Build the right-associated concatenation of several terms.
+
+        Args:
+            factors: Terms to concatenate, in order. Type: Iterable[int]
+
+        Returns:
+            Identifier of the concatenation. Type: int
+
+        """
+        factors = list(factors)
+        if self.empty in factors:
+            return self.empty
+        result = self.lambda_
+        for factor in reversed(factors):
+            if result == self.lambda_:
+                result = factor
+            elif factor != self.lambda_:
+                for part in reversed(self._factors(factor)):
+                    result = self._intern((CONCAT, part, result))
+        return result
+
+    def _star(self, term_id):
+        kind = self.terms[term_id][0]
+        if kind in (EMPTY, LAMBDA):
+            return self.lambda_
+        if kind == STAR:
+            return term_id
+        return self._intern((STAR, term_id))
+
+    def _parse(self, re_string):
+        """
+        Build the term of a regex.
+
+        Args:
+            re_string: Regular expression in Kleene's syntax. Type: str
+
+        Returns:
+            Identifier of the term. Type: int
+
+        """
+        if not re_string:
+            return self.empty
+
+        # Las concatenaciones se acumulan como listas de factores y solo se
+        # convierten en término cuando las usa otro operador (o al final)
+        def as_term(item):
+            return self._concat_factors(item) if isinstance(item, deque) else item
+
+        def as_factors(item):
+            return item if isinstance(item, deque) else deque([item])
+
+        stack = []
+        for x in _re_to_rpn(re_string):
+            if x == "*":
+                stack.append(self._star(as_term(stack.pop())))
+            elif x == "+":
+                right = as_term(stack.pop())
+                stack.append(self._union(as_term(stack.pop()), right))
+            elif x == ".":
+                right = as_factors(stack.pop())
+                left = as_factors(stack.pop())
+                if len(left) >= len(right):
+                    left.extend(right)
+                    stack.append(left)
+                else:
+                    right.extendleft(reversed(left))
+                    stack.append(right)
+            elif x == "λ":
+                stack.append(self.lambda_)
+            else:
+                stack.append(self._symbol(x))
+        return as_term(stack.pop())
+
+    def derivative(self, term_id, symbol):
+        """
+        Compute (or get from the cache) the derivative of a term.
+
+        Args:
+            term_id: Identifier of the term. Type: int
+            symbol: Symbol to derive by. Type: str
+
+        Returns:
+            Identifier of the derivative. Type: int
+
+        """
+        key = (term_id, symbol)
+        result = self.cache.get(key)
+        if result is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return result
+
+        # Recorrido en postorden con una pila explícita (los términos muy
+        # anidados y las cadenas largas agotarían la pila de Python): un
+        # término se deriva cuando ya se conocen las derivadas de los
+        # subtérminos que necesita. Las de esta llamada se guardan también
+        # aparte, porque la caché puede descartarlas antes de usarlas
+        derived = {}
+
+        def known(sub_id):
+            if sub_id in derived:
+                return True
+            sub_result = self.cache.get((sub_id, symbol))
+            if sub_result is None:
+                return False
+            self.hits += 1
+            self.cache.move_to_end((sub_id, symbol))
+            derived[sub_id] = sub_result
+            return True
+
+        pending = [term_id]
+        while pending:
+            current = pending[-1]
+            if current in derived:
+                pending.pop()
+                continue
+
+            term = self.terms[current]
+            kind = term[0]
+            if kind == UNION:
+                needed = term[1]
+            elif kind == CONCAT and self.nullable[term[1]]:
+                # Si el primer factor es anulable, también se deriva el resto
+                needed = (term[1], term[2])
+            elif kind in (CONCAT, STAR):
+                needed = (term[1],)
+            else:
+                needed = ()
+            missing = [sub_id for sub_id in needed if not known(sub_id)]
+            if missing:
+                pending.extend(missing)
+                continue
+
+            pending.pop()
+            self.misses += 1
+            if kind == SYMBOL:
+                result = self.lambda_ if term[1] == symbol else self.empty
+            elif kind == UNION:
+                result = self._union(*(derived[t] for t in needed))
+            elif kind == CONCAT:
+                result = self._concat(derived[term[1]], term[2])
+                if self.nullable[term[1]]:
+                    result = self._union(result, derived[term[2]])
+            elif kind == STAR:
+                result = self._concat(derived[term[1]], current)
+            else:
+                result = self.empty
+            derived[current] = result
+            self._store(current, symbol, result)
+
+        return derived[term_id]
+
+    def _store(self, term_id, symbol, result):
+        self.cache[(term_id, symbol)] = result
+        if len(self.cache) > self.max_cache:
+            self.cache.popitem(last=False)
+
+    def accepts(self, cadena):
+        """
+        Check if the regex matches a whole string.
+
+        Args:
+            cadena: String to evaluate. Type: str
+
+        Returns:
+            ``True`` if the string is accepted, ``False`` otherwise.
+
+        """
+        term_id = self.initial
+        for symbol in cadena:
+            term_id = self.derivative(term_id, symbol)
+            if term_id == self.empty:
+                return False
+        return self.nullable[term_id]
+
+    def to_automaton(self, complete=False):
+        """
+        Export the cached derivatives as a deterministic automaton.
+
+        Args:
+            complete: Compute every derivative reachable from the regex,
+                so that the result is the full deterministic automaton
+                instead of the part already in the cache. Type: bool
+
+        Returns:
+            Automaton whose states are terms and whose transitions are
+            derivatives. Type: FiniteAutomaton
+
+        """
+        name = "d{}".format
+        automaton = FiniteAutomaton(
+            initial_state=name(self.initial),
+            states={name(self.initial)},
+            symbols=self.symbols,
+            transitions={},
+            final_states=set()
+        )
+
+        seen = {self.initial}
+        pending = deque([self.initial])
+        while pending:
+            term_id = pending.popleft()
+            if self.nullable[term_id]:
+                automaton.final_states.add(name(term_id))
+            for symbol in self.symbols:
+                if complete:
+                    result = self.derivative(term_id, symbol)
+                else:
+                    result = self.cache.get((term_id, symbol))
+                    if result is None:
+                        continue
+                automaton.transitions.setdefault(name(term_id), {})[symbol] = {name(result)}
+                if result not in seen:
+                    seen.add(result)
+                    automaton.states.add(name(result))
+                    pending.append(result)
+        return automaton
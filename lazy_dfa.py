@@ -0,0 +1,136 @@
+"""Deterministic automaton built lazily while strings are evaluated."""
+from collections import OrderedDict
+
+
+class LazyDFA():
+    """
+    On-the-fly subset construction over a FiniteAutomaton.
+
+    Subset states are only built when ``accepts`` reaches them, and the
+    transitions between them are kept in a bounded LRU table. When the
+    table is full and most lookups miss, caching is switched off for a
+    while and the automaton is simulated directly (as an NFA).
+
+    The automaton must not be modified after wrapping it.
+    """
+
+    def __init__(self, automaton, max_transitions=10000, window=1000, thrash_ratio=0.5):
+        """
+        Args:
+            automaton: Automaton to evaluate. Type: FiniteAutomaton
+            max_transitions: Maximum number of cached transitions. Type: int
+            window: Number of steps between thrashing checks. Type: int
+            thrash_ratio: Miss ratio over a window, with the table full,
+                above which caching is switched off for the next window.
+                Type: float
+
+        """
+        self.automaton = automaton
+        self.max_transitions = max_transitions
+        self.window = window
+        self.thrash_ratio = thrash_ratio
+
+        self.initial = frozenset(automaton._lambda_check({automaton.initial_state}))
+        self.cache = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.fallbacks = 0
+
+        self._window_steps = 0
+        self._window_misses = 0
+        self._caching = True
+
+    def _move(self, subset, symbol):
+        """
+        Compute the lambda-closed successor of a subset.
+
+        Args:
+            subset: Set of states. Type: frozenset
+            symbol: Symbol read. Type: str
+
+        Returns:
+            Successor subset. Type: frozenset
+
+        """
+        automaton = self.automaton
+        targets = set()
+        for state in subset:
+            targets |= automaton.get_final_states_from_symbol_transitions(state, symbol)
+        return frozenset(self.automaton._lambda_check(targets))
+
+    def _end_window(self):
+        """Decide whether the next window uses the transition cache."""
+        if self._caching:
+            full = len(self.cache) >= self.max_transitions
+            if full and self._window_misses > self.thrash_ratio * self._window_steps:
+                self._caching = False
+                self.fallbacks += 1
+        else:
+            self._caching = True
+        self._window_steps = 0
+        self._window_misses = 0
+
+    def step(self, subset, symbol):
+        """
+        Follow one transition, using and filling the cache.
+
+        Args:
+            subset: Current subset state. Type: frozenset
+            symbol: Symbol read. Type: str
+
+        Returns:
+            Next subset state. Type: frozenset
+
+        """
+        self._window_steps += 1
+        if self._window_steps >= self.window:
+            self._end_window()
+
+        if not self._caching:
+            return self._move(subset, symbol)
+
+        key = (subset, symbol)
+        target = self.cache.get(key)
+        if target is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return target
+
+        self.misses += 1
+        self._window_misses += 1
+        target = self._move(subset, symbol)
+        self.cache[key] = target
+        if len(self.cache) > self.max_transitions:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+        return target
+
+    def accepts(self, cadena):
+        """
+        Check if the automaton accepts a string.
+
+        Args:
+            cadena: String to evaluate. Type: str
+
+        Returns:
+            ``True`` if the string is accepted, ``False`` otherwise.
+
+        """
+        subset = self.initial
+        for symbol in cadena:
+            subset = self.step(subset, symbol)
+            if not subset:
+                return False
+        return not self.automaton.final_states.isdisjoint(subset)
+
+    def stats(self):
+        """Return the cache counters as a dictionary."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "fallbacks": self.fallbacks,
+            "cached": len(self.cache),
+        }
@@ -0,0 +1,87 @@
+"""Evaluation of many regular expressions with a single automaton."""
+from automaton import FiniteAutomaton
+from re_parser import REParser
+
+
+class MultiPattern():
+    """
+    Combined automaton of several regexes in Kleene's syntax.
+
+    All the patterns are joined under a common initial state with lambda
+    transitions (as ``REParser`` builds unions), and every final state is
+    tagged with the identifier of its pattern. Determinization gives each
+    state the union of the tags of its subset, minimization only merges
+    states with the same tags, and ``match`` reads a string once,
+    whatever the number of patterns, and returns every pattern that
+    accepts it.
+    """
+
+    def __init__(self, patterns):
+        """
+        Args:
+            patterns: Regexes to combine, either a list (identified by
+                their position) or a dictionary from identifier to regex.
+                Type: Union[List[str], Dict[Hashable, str]]
+
+        """
+        if not hasattr(patterns, "items"):
+            patterns = dict(enumerate(patterns))
+
+        initial = "Empty_initial"
+        combined = FiniteAutomaton(
+            initial_state=initial,
+            states=[initial],
+            symbols=(),
+            transitions={},
+            final_states=set()
+        )
+        tags = {}
+        for i, (pattern_id, re_string) in enumerate(patterns.items()):
+            automaton = REParser().create_automaton(re_string)
+
+            # Prefijo por patrón para que no coincidan nombres de estados
+            prefix = f"p{i}_"
+            combined.states += [prefix + state for state in automaton.get_states()]
+            combined.symbols += tuple(automaton.get_symbols())
+            for state, symbol_transitions in automaton.get_transitions().items():
+                for symbol, targets in symbol_transitions.items():
+                    for target in targets:
+                        combined.add_transition(prefix + state, symbol, prefix + target)
+            combined.add_transition(initial, None, prefix + automaton.get_initial_state())
+            for final_state in automaton.get_final_states():
+                combined.final_states.add(prefix + final_state)
+                tags.setdefault(prefix + final_state, set()).add(pattern_id)
+
+        deterministic = combined.to_deterministic()
+        deterministic_tags = {}
+        for name, subset in deterministic._subsets.items():
+            deterministic_tags[name] = frozenset(
+                pattern_id for state in subset for pattern_id in tags.get(state, ())
+            )
+
+        minimized = deterministic.to_minimized(labels=deterministic_tags)
+        self.automaton = minimized
+        self.compiled = minimized.compile()
+        self.tags = [
+            deterministic_tags[next(iter(minimized._subsets[name]))]
+            for name in self.compiled.states
+        ]
+
+    def match(self, cadena):
+        """
+        Find the patterns that accept a string.
+
+        Args:
+            cadena: String to evaluate. Type: str
+
+        Returns:
+            Identifiers of the patterns that accept the string. Type: FrozenSet
+
+        """
+        compiled = self.compiled
+        state = compiled.initial
+        for symbol in cadena:
+            state = compiled.step(state, symbol)
+            if compiled.is_dead(state):
+                return frozenset()
+        return self.tags[state]
@@ -0,0 +1,113 @@
+"""Sharded multiprocess evaluation of newline-separated input files."""
+import mmap
+import os
+import time
+from multiprocessing import Pool
+
+# Estado de cada proceso trabajador (fijado una sola vez por _init_worker)
+_worker = {}
+
+
+def _init_worker(compiled, path, encoding):
+    """Store the compiled automaton and the input file in the worker."""
+    _worker["compiled"] = compiled
+    _worker["path"] = path
+    _worker["encoding"] = encoding
+
+
+def _shards(path, chunk_size):
+    """
+    Split a file in byte ranges that end on newline boundaries.
+
+    Args:
+        path: Path of the input file. Type: str
+        chunk_size: Approximate size in bytes of each shard. Type: int
+
+    Returns:
+        List of ``(start, end)`` byte ranges. Type: List[Tuple[int, int]]
+
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+
+    shards = []
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        while start < size:
+            end = min(start + chunk_size, size)
+            if end < size:
+                newline = data.find(b"\n", end - 1)
+                end = size if newline < 0 else newline + 1
+            shards.append((start, end))
+            start = end
+    return shards
+
+
+def _accept_shard(shard):
+    """
+    Evaluate the lines of a shard in a worker.
+
+    Args:
+        shard: Byte range ``(start, end)`` of the shard. Type: Tuple[int, int]
+
+    Returns:
+        Tuple with the byte offsets of the accepted lines, the number of
+        lines, the number of bytes, the elapsed seconds and the worker pid.
+
+    """
+    start, end = shard
+    accepts = _worker["compiled"].accepts
+    encoding = _worker["encoding"]
+    begin = time.perf_counter()
+
+    offsets = []
+    lines = 0
+    with open(_worker["path"], "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        position = start
+        while position < end:
+            newline = data.find(b"\n", position, end)
+            if newline < 0:
+                newline = end
+            if accepts(data[position:newline].decode(encoding)):
+                offsets.append(position)
+            lines += 1
+            position = newline + 1
+
+    return offsets, lines, end - start, time.perf_counter() - begin, os.getpid()
+
+
+def accepted_offsets(automaton, path, workers=None, chunk_size=1 << 26, stats=None, encoding="utf-8"):
+    """
+    Yield the byte offsets of the lines of a file accepted by an automaton.
+
+    The automaton is compiled (determinizing it first if needed) and sent
+    once to each worker; each worker memory-maps the file and evaluates
+    the shards it receives. Offsets are yielded in file order as soon as
+    their shard is finished.
+
+    Args:
+        automaton: Automaton used to evaluate the lines. Type: FiniteAutomaton
+        path: Path of the newline-separated input file. Type: str
+        workers: Number of worker processes (``os.cpu_count()`` if None). Type: int
+        chunk_size: Approximate size in bytes of each shard. Type: int
+        stats: Optional dictionary filled with the lines, bytes, seconds
+            and throughput of each worker pid. Type: dict
+        encoding: Encoding of the input file. Type: str
+
+    Returns:
+        Generator of byte offsets. Type: Iterator[int]
+
+    """
+    compiled = automaton._deterministic_table()
+
+    shards = _shards(path, chunk_size)
+    with Pool(workers, initializer=_init_worker, initargs=(compiled, path, encoding)) as pool:
+        for offsets, lines, size, seconds, pid in pool.imap(_accept_shard, shards):
+            if stats is not None:
+                worker = stats.setdefault(pid, {"lines": 0, "bytes": 0, "seconds": 0.0})
+                worker["lines"] += lines
+                worker["bytes"] += size
+                worker["seconds"] += seconds
+                worker["lines_per_second"] = worker["lines"] / worker["seconds"] if worker["seconds"] else 0.0
+            yield from offsets
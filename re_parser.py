@@ -3,8 +3,10 @@
     Última modificación: 18 de septiembre de 2025
 """
 
+import threading
+from collections import OrderedDict
+
 from automaton import FiniteAutomaton
-from utils import AutomataFormat
 
 def _re_to_rpn(re_string):
     """
@@ -49,8 +51,12 @@ def _re_to_rpn(re_string):
 class REParser():
     """Class for processing regular expressions in Kleene's syntax."""
     
-    def __init__(self) -> None:
+    def __init__(self, mode="thompson") -> None:
+        if mode not in ("thompson", "glushkov"):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.mode = mode
         self.state_counter = 0
+        self.edges = []
 
     def _create_automaton_empty(self):
         """
@@ -60,313 +66,347 @@ class REParser():
             Automaton that accepts the empty language. Type: FiniteAutomaton
 
         """
-        description = """
-        Automaton:
-            Symbols: 
-
-            q0
-
-            ini q0
-        """
-
-        return AutomataFormat.read(description)
+        return FiniteAutomaton(
+            initial_state = "q0",
+            states = ["q0"],
+            symbols = (),
+            transitions = {},
+            final_states = set()
+        )
         
 
-    def _create_automaton_lambda(self):
+    def create_automaton(
+        self,
+        re_string,
+    ):
         """
-        Create an automaton that accepts the empty string.
+        Create an automaton from a regex.
+
+        Args:
+            re_string: String with the regular expression in Kleene notation. Type: str
 
         Returns:
-            Automaton that accepts the empty string. Type: FiniteAutomaton
+            Automaton equivalent to the regex. Type: FiniteAutomaton
 
         """
-        description = """
-        Automaton:
-            Symbols: 
+        if not re_string:
+            return self._create_automaton_empty()
+        
+        rpn_string = _re_to_rpn(re_string)
 
-            q0 final
+        if self.mode == "glushkov":
+            return self._create_automaton_glushkov(rpn_string)
 
-            ini q0
-        """
-        return AutomataFormat.read(description)
+        stack = [] # list of fragments (initial state, final state)
+
+        self.state_counter = 0
+        self.edges = []
+        for x in rpn_string:
+            if x == "*":
+                fragment = stack.pop()
+                stack.append(self._fragment_star(fragment))
+            elif x == "+":
+                fragment2 = stack.pop()
+                fragment1 = stack.pop()
+                stack.append(self._fragment_union(fragment1, fragment2))
+            elif x == ".":
+                fragment2 = stack.pop()
+                fragment1 = stack.pop()
+                stack.append(self._fragment_concat(fragment1, fragment2))
+            elif x == "λ":
+                stack.append(self._fragment_lambda())
+            else:
+                stack.append(self._fragment_symbol(x))
 
+        return self._fragment_to_automaton(stack.pop())
 
-    def _create_automaton_symbol(self, symbol):
+    def _create_automaton_glushkov(self, rpn_string):
         """
-        Create an automaton that accepts one symbol.
+        Create the position (Glushkov) automaton of a regex.
+
+        Each symbol of the regex is a position and a state; the automaton
+        has one more state (the initial one) and no lambda transitions.
 
         Args:
-            symbol: Symbol that the automaton should accept. Type: str
+            rpn_string: Regular expression in reverse polish notation. Type: str
 
         Returns:
-            Automaton that accepts a symbol. Type: FiniteAutomaton
+            Automaton equivalent to the regex. Type: FiniteAutomaton
 
         """
-        description = f"""
-        Automaton:
-            Symbols: {symbol}
+        position_symbols = [None] # position 0 is the initial state
+        follow = [set()]
 
-            q0
-            q1 final
+        stack = [] # list of (nullable, first positions, last positions)
+        for x in rpn_string:
+            if x == "*":
+                _, first, last = stack.pop()
+                for position in last:
+                    follow[position] |= first
+                stack.append((True, first, last))
+            elif x == "+":
+                nullable2, first2, last2 = stack.pop()
+                nullable1, first1, last1 = stack.pop()
+                first1 |= first2
+                last1 |= last2
+                stack.append((nullable1 or nullable2, first1, last1))
+            elif x == ".":
+                nullable2, first2, last2 = stack.pop()
+                nullable1, first1, last1 = stack.pop()
+                for position in last1:
+                    follow[position] |= first2
+                if nullable1:
+                    first1 |= first2
+                if nullable2:
+                    last2 |= last1
+                stack.append((nullable1 and nullable2, first1, last2))
+            elif x == "λ":
+                stack.append((True, set(), set()))
+            else:
+                position = len(position_symbols)
+                position_symbols.append(x)
+                follow.append(set())
+                stack.append((False, {position}, {position}))
 
-            ini q0 -{symbol}-> q1
-        """
-        return AutomataFormat.read(description)
+        nullable, first, last = stack.pop()
+        follow[0] = first
 
+        states = [f"q{i}" for i in range(len(position_symbols))]
+        transitions = {}
+        for position, targets in enumerate(follow):
+            for target in targets:
+                transitions.setdefault(states[position], {}).setdefault(
+                    position_symbols[target], set()).add(states[target])
+
+        final_states = {states[position] for position in last}
+        if nullable:
+            final_states.add(states[0])
+
+        return FiniteAutomaton(
+            initial_state = states[0],
+            states = states,
+            symbols = tuple(dict.fromkeys(position_symbols[1:])),
+            transitions = transitions,
+            final_states = final_states
+        )
 
-    def _create_automaton_star(self, automaton):
+    def _new_state(self):
         """
-        Create an automaton that accepts the Kleene star of another.
-
-        Args:
-            automaton: Automaton whose Kleene star must be computed. Type: FiniteAutomaton
+        Allocate a new state of the Thompson construction.
 
         Returns:
-            Automaton that accepts the Kleene star. Type: FiniteAutomaton
+            Number of the new state. Type: int
 
         """
-        empty_initial = f"Empty_initial_{self.state_counter}"
-        empty_final = f"Empty_final_{self.state_counter}"
+        state = self.state_counter
         self.state_counter += 1
-        
-        # Copiar transiciones para no compartir referencia con el autómata original
-        import copy
-        copied_transitions = copy.deepcopy(automaton.get_transitions())
-
-        kleene_automaton = FiniteAutomaton(
-            initial_state = empty_initial,
-            states = automaton.get_states() + [empty_initial, empty_final],
-            symbols = automaton.get_symbols(),
-            transitions = copied_transitions,
-            final_states = {empty_final}
-        )
+        return state
 
-        # Transiciones lambda (usar None en lugar de "λ")
-        # 1. Desde empty_initial al estado inicial del autómata
-        kleene_automaton.add_transition(empty_initial, None, automaton.get_initial_state())
-        
-        # 2. Desde empty_initial directamente a empty_final (para aceptar cadena vacía)
-        kleene_automaton.add_transition(empty_initial, None, empty_final)
-        
-        # 3. Desde estados finales del autómata a empty_final
-        for final_state in automaton.get_final_states():
-            kleene_automaton.add_transition(final_state, None, empty_final)
-        
-        # 4. Desde estados finales del autómata de vuelta al inicio (para repetir)
-        for final_state in automaton.get_final_states():
-            kleene_automaton.add_transition(final_state, None, automaton.get_initial_state())
+    def _fragment_lambda(self):
+        """
+        Create a fragment that accepts the empty string.
 
-        return kleene_automaton
+        Returns:
+            Initial and final state of the fragment. Type: Tuple[int, int]
 
-    def _create_automaton_union(self, automaton1, automaton2):
         """
-        Create an automaton that accepts the union of two automata.
+        state = self._new_state()
+        return state, state
+
+    def _fragment_symbol(self, symbol):
+        """
+        Create a fragment that accepts one symbol.
 
         Args:
-            automaton1: First automaton of the union. Type: FiniteAutomaton.
-            automaton2: Second automaton of the union. Type: FiniteAutomaton.
+            symbol: Symbol that the fragment should accept. Type: str
 
         Returns:
-            Automaton that accepts the union. Type: FiniteAutomaton.
+            Initial and final state of the fragment. Type: Tuple[int, int]
 
         """
-        empty_initial = f"Empty_initial_{self.state_counter}"
-        empty_final = f"Empty_final_{self.state_counter}"
-        self.state_counter += 1
-        
-        # Renombrar estados de automaton1
-        automaton1state_transfer = {}
-        for state in automaton1.get_states():
-            automaton1state_transfer[state] = "q" + str(self.state_counter)
-            self.state_counter += 1
-        automaton1states = list(automaton1state_transfer.values())
-        
-        # Renombrar transiciones de automaton1
-        automaton1transitions = {}
-        for ss, dct in automaton1.get_transitions().items():
-            n_ss = automaton1state_transfer[ss]
-            automaton1transitions[n_ss] = {}  # ← Inicializar diccionario para este estado
-            for k, v in dct.items():
-                n_v = set()
-                for state in v:
-                    n_v.add(automaton1state_transfer[state])
-                automaton1transitions[n_ss][k] = n_v  # ← Guardar cada símbolo correctamente
-        
-        # Renombrar estados de automaton2
-        automaton2state_transfer = {}
-        for state in automaton2.get_states():
-            automaton2state_transfer[state] = "q" + str(self.state_counter)
-            self.state_counter += 1
-        automaton2states = list(automaton2state_transfer.values())
-        
-        # Renombrar transiciones de automaton2
-        automaton2transitions = {}
-        for ss, dct in automaton2.get_transitions().items():
-            n_ss = automaton2state_transfer[ss]
-            automaton2transitions[n_ss] = {}  # ← Inicializar diccionario para este estado
-            for k, v in dct.items():
-                n_v = set()
-                for state in v:
-                    n_v.add(automaton2state_transfer[state])
-                automaton2transitions[n_ss][k] = n_v  # ← Guardar cada símbolo correctamente
-            
-        # Crear autómata unión
-        union_automaton = FiniteAutomaton(
-            initial_state = empty_initial,
-            states = automaton1states + automaton2states + [empty_final, empty_initial],
-            symbols = automaton1.get_symbols() + automaton2.get_symbols(),
-            transitions = automaton1transitions | automaton2transitions,
-            final_states = {empty_final}
-        )
+        initial, final = self._new_state(), self._new_state()
+        self.edges.append((initial, symbol, final))
+        return initial, final
 
-        # Conectar empty_initial con ambos autómatas (bifurcación)
-        union_automaton.add_transition(empty_initial, None, automaton1state_transfer[automaton1.get_initial_state()])
-        union_automaton.add_transition(empty_initial, None, automaton2state_transfer[automaton2.get_initial_state()])
-        
-        # Conectar estados finales de automaton1 con empty_final
-        for final_state in automaton1.get_final_states():
-            renamed_final = automaton1state_transfer[final_state]  # ← Usar nombre renombrado
-            union_automaton.add_transition(renamed_final, None, empty_final)
-        
-        # Conectar estados finales de automaton2 con empty_final
-        for final_state in automaton2.get_final_states():
-            renamed_final = automaton2state_transfer[final_state]  # ← Usar nombre renombrado
-            union_automaton.add_transition(renamed_final, None, empty_final)
+    def _fragment_star(self, fragment):
+        """
+        Create a fragment that accepts the Kleene star of another.
 
-        return union_automaton
+        Args:
+            fragment: Fragment whose Kleene star must be computed. Type: Tuple[int, int]
 
+        Returns:
+            Initial and final state of the fragment. Type: Tuple[int, int]
 
-    def _create_automaton_concat(self, automaton1, automaton2):
         """
-        Create an automaton that accepts the concatenation of two automata.
+        initial, final = self._new_state(), self._new_state()
+        self.edges.append((initial, None, fragment[0]))
+        self.edges.append((initial, None, final))
+        self.edges.append((fragment[1], None, fragment[0]))
+        self.edges.append((fragment[1], None, final))
+        return initial, final
+
+    def _fragment_union(self, fragment1, fragment2):
+        """
+        Create a fragment that accepts the union of two fragments.
 
         Args:
-            automaton1: First automaton of the concatenation. Type: FiniteAutomaton.
-            automaton2: Second automaton of the concatenation. Type: FiniteAutomaton.
+            fragment1: First fragment of the union. Type: Tuple[int, int]
+            fragment2: Second fragment of the union. Type: Tuple[int, int]
 
         Returns:
-            Automaton that accepts the concatenation. Type: FiniteAutomaton.
+            Initial and final state of the fragment. Type: Tuple[int, int]
 
         """
-        empty_initial = f"Empty_initial_{self.state_counter}"
-        empty_final = f"Empty_final_{self.state_counter}"
-        self.state_counter += 1
+        initial, final = self._new_state(), self._new_state()
+        self.edges.append((initial, None, fragment1[0]))
+        self.edges.append((initial, None, fragment2[0]))
+        self.edges.append((fragment1[1], None, final))
+        self.edges.append((fragment2[1], None, final))
+        return initial, final
+
+    def _fragment_concat(self, fragment1, fragment2):
+        """
+        Create a fragment that accepts the concatenation of two fragments.
 
-        # Obtener mapeos de estados antiguos->nuevos y listas de estados
-        automaton1state_transfer = self._change_state_names(automaton1)
-        automaton2state_transfer = self._change_state_names(automaton2)
-        automaton1states = list(automaton1state_transfer.values())
-        automaton2states = list(automaton2state_transfer.values())
-
-        # Renombrar transiciones usando los mapeos
-        automaton1transitions = self._change_transition_names(automaton1, automaton1state_transfer)
-        automaton2transitions = self._change_transition_names(automaton2, automaton2state_transfer)
-
-        # Crear autómata concatenado
-        concat_automaton = FiniteAutomaton(
-            initial_state = empty_initial,
-            states = automaton1states + automaton2states + [empty_final, empty_initial],
-            symbols = automaton1.get_symbols() + automaton2.get_symbols(),
-            transitions = automaton1transitions | automaton2transitions,
-            final_states = {empty_final}
-        )
-        
-        # Conectar empty_initial con el inicio de automaton1
-        concat_automaton.add_transition(empty_initial, None, automaton1state_transfer[automaton1.get_initial_state()])
-        
-        # Conectar estados finales de automaton1 con el inicio de automaton2
-        for final_state in automaton1.get_final_states():
-            renamed_final = automaton1state_transfer[final_state]  # ← Usar nombre renombrado
-            concat_automaton.add_transition(renamed_final, None, automaton2state_transfer[automaton2.get_initial_state()])
+        Args:
+            fragment1: First fragment of the concatenation. Type: Tuple[int, int]
+            fragment2: Second fragment of the concatenation. Type: Tuple[int, int]
 
-        # Conectar estados finales de automaton2 con empty_final
-        for final_state in automaton2.get_final_states():
-            renamed_final = automaton2state_transfer[final_state]  # ← Usar nombre renombrado
-            concat_automaton.add_transition(renamed_final, None, empty_final)
-            
+        Returns:
+            Initial and final state of the fragment. Type: Tuple[int, int]
 
-        return concat_automaton
+        """
+        self.edges.append((fragment1[1], None, fragment2[0]))
+        return fragment1[0], fragment2[1]
 
-    def create_automaton(
-        self,
-        re_string,
-    ):
+    def _fragment_to_automaton(self, fragment):
         """
-        Create an automaton from a regex.
+        Build the automaton of a fragment from the list of edges.
 
         Args:
-            re_string: String with the regular expression in Kleene notation. Type: str
+            fragment: Fragment with the whole regex. Type: Tuple[int, int]
 
         Returns:
-            Automaton equivalent to the regex. Type: FiniteAutomaton
+            Automaton equivalent to the fragment. Type: FiniteAutomaton
 
         """
-        if not re_string:
-            return self._create_automaton_empty()
-        
-        rpn_string = _re_to_rpn(re_string)
-
-        stack = [] # list of FiniteAutomatons
+        states = [f"q{i}" for i in range(self.state_counter)]
+        symbols = {}
+        transitions = {}
+        for start, symbol, end in self.edges:
+            if symbol is not None:
+                symbols[symbol] = None
+            transitions.setdefault(states[start], {}).setdefault(symbol, set()).add(states[end])
+
+        return FiniteAutomaton(
+            initial_state = states[fragment[0]],
+            states = states,
+            symbols = tuple(symbols),
+            transitions = transitions,
+            final_states = {states[fragment[1]]}
+        )
 
-        self.state_counter = 0
-        for x in rpn_string:
-            if x == "*":
-                aut = stack.pop()
-                stack.append(self._create_automaton_star(aut))
-            elif x == "+":
-                aut2 = stack.pop()
-                aut1 = stack.pop()
-                stack.append(self._create_automaton_union(aut1, aut2))
-            elif x == ".":
-                aut2 = stack.pop()
-                aut1 = stack.pop()
-                stack.append(self._create_automaton_concat(aut1, aut2))
-            elif x == "λ":
-                stack.append(self._create_automaton_lambda())
-            else:
-                stack.append(self._create_automaton_symbol(x))
 
-        return stack.pop()
-    
-    def _change_state_names(self, automaton):
-        """
-        Build a mapping from old state names to new unique names (no collisions).
+class AutomatonCache():
+    """
+    Thread-safe LRU cache of the automata built from regexes.
 
-        Args:
-            automaton: Automaton whose states must be renamed. Type: FiniteAutomaton
+    Entries are keyed by the construction mode and the RPN of the regex,
+    so parenthesizations with the same RPN share an entry. Each entry
+    holds the automaton built by ``REParser`` and, when requested, its
+    deterministic and minimized forms. Cached automata are shared between
+    callers and must not be modified.
+    """
 
-        Returns:
-            Dict[str, str]: mapping from old state -> new state name
+    FORMS = ("nfa", "deterministic", "minimized")
 
+    def __init__(self, max_size=128):
         """
-        state_transfer = {}
-        for state in automaton.get_states():
-            state_transfer[state] = "q" + str(self.state_counter)
-            self.state_counter += 1
-
-        return state_transfer
+        Args:
+            max_size: Maximum number of cached regexes. Type: int
 
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
 
-    def _change_transition_names(self, automaton, state_transfer):
+    def get(self, re_string, form="nfa", mode="thompson"):
         """
-        Change transition state names to avoid conflicts.
+        Get the automaton of a regex, building it if it is not cached.
 
         Args:
-            automaton: Automaton whose transitions must be renamed. Type: FiniteAutomaton
-            state_transfer: Dictionary mapping old state names to new ones. Type: Dict[str, str]
+            re_string: Regular expression in Kleene's syntax. Type: str
+            form: "nfa", "deterministic" or "minimized". Type: str
+            mode: Construction mode of ``REParser``. Type: str
 
         Returns:
-            Dict[str, Dict[Optional[str], Set[str]]]: transitions with renamed states
+            Automaton equivalent to the regex. Type: FiniteAutomaton
 
         """
-        transitions = {}
-        for ss, dct in automaton.get_transitions().items():
-            n_ss = state_transfer[ss]
-            transitions[n_ss] = {}
-            for k, v in dct.items():
-                n_v = set()
-                for state in v:
-                    n_v.add(state_transfer[state])
-                transitions[n_ss][k] = n_v
-
-        return transitions
\ No newline at end of file
+        if form not in self.FORMS:
+            raise ValueError(f"Unknown form: {form}")
+        key = (mode, _re_to_rpn(re_string))
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and form in entry:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return entry[form]
+            self.misses += 1
+
+        # Se construye fuera del cerrojo; si otro hilo lo ha guardado
+        # mientras tanto, se usa su versión
+        entry = dict(entry or {})
+        if "nfa" not in entry:
+            entry["nfa"] = REParser(mode=mode).create_automaton(re_string)
+        if form != "nfa" and "deterministic" not in entry:
+            entry["deterministic"] = entry["nfa"].to_deterministic()
+        if form == "minimized" and "minimized" not in entry:
+            entry["minimized"] = entry["deterministic"].to_minimized()
+
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached is not None:
+                for cached_form, automaton in cached.items():
+                    entry[cached_form] = automaton
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+            return entry[form]
+
+    def stats(self):
+        """Return the hit and miss counters and the number of entries."""
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+automaton_cache = AutomatonCache()
+
+
+def compile_automaton(re_string, form="nfa", mode="thompson"):
+    """
+    Get the automaton of a regex from the process-wide cache.
+
+    Args:
+        re_string: Regular expression in Kleene's syntax. Type: str
+        form: "nfa", "deterministic" or "minimized". Type: str
+        mode: Construction mode of ``REParser``. Type: str
+
+    Returns:
+        Automaton equivalent to the regex (shared, must not be modified).
+        Type: FiniteAutomaton
+
+    """
+    return automaton_cache.get(re_string, form, mode)
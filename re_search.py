@@ -0,0 +1,145 @@
+"""Search of regular expression matches inside a text."""
+from array import array
+
+from re_parser import REParser
+
+
+class RESearcher():
+    """
+    Find the matches of a regex in Kleene's syntax inside a text.
+
+    Matches follow leftmost-longest semantics: among the matches that
+    start at the leftmost possible position, the longest one is chosen.
+    ``finditer`` reports non-overlapping matches, resuming after the end
+    of the previous one (or one position later if it was empty).
+
+    A single backwards pass over the text, with the deterministic
+    automaton of the reversed regex preceded by a Σ* loop, marks every
+    position where some match starts. Each match is then extended
+    forwards with the minimal deterministic automaton of the regex until
+    it reaches a dead state. The longest end reachable from every visited
+    (position, state) pair is remembered, so an extension stops as soon
+    as it reaches a pair already expanded: each pair is expanded at most
+    once and the search takes O(len(text) * states) steps. Pairs behind
+    the last match are forgotten, so memory depends on how far the
+    extensions reach past it, not on the length of the text.
+    """
+
+    def __init__(self, re_string):
+        """
+        Args:
+            re_string: Regular expression in Kleene's syntax. Type: str
+
+        """
+        nfa = REParser().create_automaton(re_string)
+        self.forward = nfa.to_deterministic().to_minimized().compile()
+
+        # Autómata inverso con un bucle Σ* delante: acepta tras leer (hacia
+        # atrás) text[i:] si alguna coincidencia empieza en i
+        reverse = nfa._reverse()
+        loop = "Sigma_loop"
+        while loop in reverse.states or loop in reverse.transitions:
+            loop += "_"
+        for symbol in self.forward.symbols:
+            reverse.add_transition(loop, symbol, loop)
+        for final_state in nfa.get_final_states():
+            reverse.add_transition(loop, None, final_state)
+        self.backward = reverse._determinize({loop}).compile()
+
+    def _match_starts(self, text):
+        """
+        Mark the positions of the text where a match starts.
+
+        Args:
+            text: Text to search. Type: str
+
+        Returns:
+            Flag per position (``len(text) + 1`` entries). Type: bytearray
+
+        """
+        backward = self.backward
+        starts = bytearray(len(text) + 1)
+        state = backward.initial
+        starts[len(text)] = backward.is_final(state)
+        for position in range(len(text) - 1, -1, -1):
+            state = backward.step(state, text[position])
+            if state < 0:
+                # Símbolo fuera del alfabeto: solo sigue vivo el bucle Σ*
+                state = backward.initial
+            starts[position] = backward.is_final(state)
+        return starts
+
+    def finditer(self, text):
+        """
+        Iterate over the non-overlapping matches of the regex in a text.
+
+        Args:
+            text: Text to search. Type: str
+
+        Returns:
+            Iterator of ``(start, end)`` offsets. Type: Iterator[Tuple[int, int]]
+
+        """
+        forward = self.forward
+        starts = self._match_starts(text)
+
+        # Final más largo alcanzable desde cada par (posición, estado) ya
+        # visitado por una extensión (-2 si no se ha visitado), en una tabla
+        # por estado que empieza en la posición base. Las extensiones solo
+        # avanzan, así que las posiciones anteriores a la siguiente búsqueda
+        # se descartan cuando ocupan al menos la mitad de la tabla
+        n_states = len(forward.final)
+        memo = array("i")
+        base = 0
+
+        position = 0
+        while position <= len(text):
+            start = starts.find(1, position)
+            if start < 0:
+                return
+
+            # Extensión hacia delante hasta un estado muerto o ya memorizado
+            state = forward.initial
+            states = array("i")
+            end = -1
+            current = start
+            while True:
+                index = (current - base) * n_states + state
+                if index < len(memo) and memo[index] != -2:
+                    end = memo[index]
+                    break
+                states.append(state)
+                if current == len(text):
+                    break
+                state = forward.step(state, text[current])
+                current += 1
+                if forward.is_dead(state):
+                    break
+
+            size = (start + len(states) - base) * n_states
+            if len(memo) < size:
+                memo.extend(array("i", [-2]) * (size - len(memo)))
+            for offset in range(len(states) - 1, -1, -1):
+                state = states[offset]
+                if forward.is_final(state):
+                    end = max(end, start + offset)
+                memo[(start + offset - base) * n_states + state] = end
+
+            yield start, end
+            position = end if end > start else end + 1
+            if 2 * (position - base) * n_states >= len(memo):
+                del memo[:(position - base) * n_states]
+                base = position
+
+    def search(self, text):
+        """
+        Find the leftmost-longest match of the regex in a text.
+
+        Args:
+            text: Text to search. Type: str
+
+        Returns:
+            ``(start, end)`` offsets of the match, or ``None``. Type: Optional[Tuple[int, int]]
+
+        """
+        return next(self.finditer(text), None)
@@ -0,0 +1,62 @@
+"""Test antichain inclusion and universality of NFAs."""
+import unittest
+
+from re_parser import REParser
+from utils import antichain_included, antichain_universal
+
+
+class TestAntichain(unittest.TestCase):
+    """Tests for the antichain inclusion and universality checks."""
+
+    simulation = False
+
+    def _create(self, regex):
+        return REParser().create_automaton(regex)
+
+    def test_included(self):
+        """Test inclusion in both directions."""
+        automaton1 = self._create("(a+b)*.a.(a+b).(a+b)")
+        automaton2 = self._create("(a+b)*.a.(a+b)*")
+
+        result, counterexample, explored = antichain_included(
+            automaton1, automaton2, simulation=self.simulation)
+        self.assertEqual((result, counterexample), (True, None))
+        self.assertGreater(explored, 0)
+
+        result, counterexample, _ = antichain_included(
+            automaton2, automaton1, simulation=self.simulation)
+        self.assertFalse(result)
+        self.assertTrue(automaton2.accepts(counterexample))
+        self.assertFalse(automaton1.accepts(counterexample))
+
+    def test_universal(self):
+        """Test universality, also over a larger alphabet."""
+        automaton = self._create("(a+b)*.a.b+(λ+a+b).(λ+a+b)+(a+b)*.(a.a+b.a+b.b)")
+
+        result, counterexample, _ = antichain_universal(automaton, simulation=self.simulation)
+        self.assertEqual((result, counterexample), (True, None))
+
+        result, counterexample, _ = antichain_universal(
+            automaton, symbols="abc", simulation=self.simulation)
+        self.assertFalse(result)
+        self.assertEqual(counterexample, "c")
+
+    def test_max_states(self):
+        """Test that the check gives up when it exceeds the memory cap."""
+        automaton1 = self._create("(a+b)*.a" + ".(a+b)" * 8)
+        automaton2 = self._create("(b+a)*.a" + ".(b+a)" * 8)
+
+        result, counterexample, explored = antichain_included(
+            automaton1, automaton2, simulation=self.simulation, max_states=10)
+        self.assertEqual((result, counterexample), (None, None))
+        self.assertGreater(explored, 10)
+
+
+class TestAntichainSimulation(TestAntichain):
+    """Antichain tests with simulation-based pruning."""
+
+    simulation = True
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Test reading automata in the custom text format."""
+import io
+import unittest
+
+from utils import AutomataFormat, FormatParseError
+
+
+class TestAutomataFormat(unittest.TestCase):
+    """Tests for the text format reader."""
+
+    description = """
+    # Strings over {a, b} that end with an a
+    Automaton:
+        Symbols: ab
+
+        q0
+        q1 final
+
+        ini q0 -a-> q1
+        q0 -b-> q0
+        q1 -a-> q1
+        q1 -b-> q0
+        q1 --> q0
+    """
+
+    def test_file(self):
+        """Test that a file object and a string give the same automaton."""
+        from_string = AutomataFormat.read(self.description)
+        from_file = AutomataFormat.read(io.StringIO(self.description))
+
+        for automaton in (from_string, from_file):
+            self.assertEqual(automaton.initial_state, "q0")
+            self.assertEqual(automaton.symbols, ("a", "b"))
+            self.assertEqual(automaton.states, {"q0", "q1"})
+            self.assertEqual(automaton.final_states, {"q1"})
+            self.assertEqual(automaton.transitions["q1"], {"a": {"q1"}, "b": {"q0"}, None: {"q0"}})
+
+    def test_iterable(self):
+        """Test reading from a generator of lines."""
+        lines = (line for line in self.description.splitlines())
+        automaton = AutomataFormat.read(lines)
+        self.assertTrue(automaton.accepts("bba"))
+        self.assertFalse(automaton.accepts("ab"))
+
+    def test_errors(self):
+        """Test that errors report the line number."""
+        invalid = self.description.replace("q0 -b-> q0", "q0 -b-> ")
+        with self.assertRaises(FormatParseError) as context:
+            AutomataFormat.read(invalid)
+        self.assertEqual(context.exception.line_number, 10)
+        self.assertIn("Line 10", str(context.exception))
+
+        with self.assertRaises(FormatParseError) as context:
+            AutomataFormat.read("q0\nAutomaton:\n")
+        self.assertEqual(context.exception.line_number, 1)
+
+        with self.assertRaises(FormatParseError) as context:
+            AutomataFormat.read(self.description.replace("ini ", ""))
+        self.assertIsNone(context.exception.line_number)
+
+
+if __name__ == '__main__':
+    unittest.main()
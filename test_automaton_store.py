@@ -0,0 +1,70 @@
+"""Test the on-disk cache of compiled automata."""
+import os
+import pickle
+import tempfile
+import unittest
+
+from automaton_store import AutomatonStore, load_compiled, save_compiled
+from re_parser import REParser
+
+
+class TestAutomatonStore(unittest.TestCase):
+    """Tests for the on-disk cache."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = AutomatonStore(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _check_accept(self, compiled, string, should_accept = True):
+        with self.subTest(string=string):
+            self.assertEqual(compiled.accepts(string), should_accept)
+
+    def test_round_trip(self):
+        """Test that a mapped automaton accepts the same strings."""
+        regex = "(a+b)*.a.(a+b)"
+        built = REParser().create_automaton(regex).to_deterministic().to_minimized().compile()
+        path = os.path.join(self.directory.name, "automaton.autl")
+        save_compiled(built, path)
+        loaded = load_compiled(path)
+
+        self.assertEqual(loaded.symbols, built.symbols)
+        self.assertEqual(list(loaded.table), list(built.table))
+        for string in ["", "a", "aa", "ab", "ba", "abab", "abba", "bbbab"]:
+            self._check_accept(loaded, string, built.accepts(string))
+
+        copy = pickle.loads(pickle.dumps(loaded))
+        self._check_accept(copy, "bab", should_accept=True)
+
+    def test_warm_start(self):
+        """Test that the second lookup maps the stored file."""
+        cold = self.store.get("a*.b", mode="glushkov")
+        self.assertFalse(hasattr(cold, "_buffer"))
+        warm = self.store.get("a*.b", mode="glushkov")
+        self.assertTrue(hasattr(warm, "_buffer"))
+
+        for string in ["b", "aab", "a", "ba"]:
+            self._check_accept(warm, string, cold.accepts(string))
+
+    def test_stale_file(self):
+        """Test that corrupted or truncated files are rebuilt."""
+        path = self.store.path("a.b")
+        self.store.get("a.b")
+
+        with open(path, "r+b") as file:
+            file.write(b"XXXX")
+        self.assertIsNone(load_compiled(path))
+        self.assertFalse(os.path.exists(path))
+
+        self.store.get("a.b")
+        with open(path, "r+b") as file:
+            file.truncate(os.path.getsize(path) - 1)
+        self.assertIsNone(load_compiled(path))
+
+        self._check_accept(self.store.get("a.b"), "ab", should_accept=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
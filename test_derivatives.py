@@ -0,0 +1,86 @@
+"""Test regex matching with Brzozowski derivatives."""
+import unittest
+
+from derivatives import DerivativeMatcher
+from re_parser import REParser
+from utils import deterministic_automata_isomorphism
+
+
+class TestDerivatives(unittest.TestCase):
+    """Tests for the derivative matcher."""
+
+    def _check_accept(self, evaluator, string, should_accept = True):
+        with self.subTest(string=string):
+            accepted = evaluator.accepts(string)
+            self.assertEqual(accepted, should_accept)
+
+    def test_star(self):
+        """Test Kleene star."""
+        evaluator = DerivativeMatcher("a*.b*")
+
+        self._check_accept(evaluator, "", should_accept=True)
+        self._check_accept(evaluator, "aab", should_accept=True)
+        self._check_accept(evaluator, "abb", should_accept=True)
+        self._check_accept(evaluator, "aba", should_accept=False)
+        self._check_accept(evaluator, "c", should_accept=False)
+
+    def test_lambda(self):
+        """Test empty string and empty language."""
+        evaluator = DerivativeMatcher("a.(λ+b)")
+
+        self._check_accept(evaluator, "a", should_accept=True)
+        self._check_accept(evaluator, "ab", should_accept=True)
+        self._check_accept(evaluator, "", should_accept=False)
+
+        evaluator = DerivativeMatcher("")
+
+        self._check_accept(evaluator, "", should_accept=False)
+
+    def test_long_nullable_chain(self):
+        """Test a long concatenation of nullable factors."""
+        evaluator = DerivativeMatcher(".".join(["(a*)"] * 2000) + ".b")
+
+        self._check_accept(evaluator, "aaab", should_accept=True)
+        self._check_accept(evaluator, "b", should_accept=True)
+        self._check_accept(evaluator, "aaa", should_accept=False)
+
+    def test_deep_nesting(self):
+        """Test regexes nested deeper than the recursion limit."""
+        evaluator = DerivativeMatcher("(" * 1200 + "a" + ")*.b" * 1200)
+
+        self._check_accept(evaluator, "b", should_accept=True)
+        self._check_accept(evaluator, "bb", should_accept=True)
+        self._check_accept(evaluator, "c", should_accept=False)
+
+        regex = "a"
+        for _ in range(1200):
+            regex = "(" + regex + "+b).b"
+        evaluator = DerivativeMatcher(regex)
+
+        self._check_accept(evaluator, "b", should_accept=False)
+        self._check_accept(evaluator, "bb", should_accept=True)
+
+    def test_bounded_cache(self):
+        """Test that the cache never exceeds its bound."""
+        evaluator = DerivativeMatcher("(a+b)*.a.(a+b).(a+b)", max_cache=4)
+
+        self._check_accept(evaluator, "abaabbab", should_accept=False)
+        self._check_accept(evaluator, "abaabbaab", should_accept=True)
+        self.assertLessEqual(len(evaluator.cache), 4)
+
+    def test_to_automaton(self):
+        """Test that the exported automaton minimizes to the regex DFA."""
+        regex = "(a+b)*.a.(a+b)"
+        evaluator = DerivativeMatcher(regex)
+        self._check_accept(evaluator, "aab", should_accept=True)
+
+        partial = evaluator.to_automaton()
+        self.assertTrue(partial.accepts("aab"))
+
+        exported = evaluator.to_automaton(complete=True).to_minimized()
+        expected = REParser().create_automaton(regex).to_deterministic().to_minimized()
+        self.assertIsNotNone(deterministic_automata_isomorphism(exported, expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
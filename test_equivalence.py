@@ -0,0 +1,61 @@
+"""Test language equivalence and inclusion of automata."""
+import unittest
+
+from re_parser import REParser
+from utils import AutomataFormat, equivalent, included
+
+
+class TestEquivalence(unittest.TestCase):
+    """Tests for the Hopcroft-Karp equivalence and inclusion checks."""
+
+    def _create(self, regex):
+        return REParser().create_automaton(regex)
+
+    def test_equivalent(self):
+        """Test regex rewrites that keep the language."""
+        for regex1, regex2 in [
+            ("(a+b)*", "(a*.b*)*"),
+            ("a.(b.a)*", "(a.b)*.a"),
+            ("(a+λ).b*", "b*+a.b*"),
+        ]:
+            with self.subTest(regex1=regex1, regex2=regex2):
+                self.assertEqual(
+                    equivalent(self._create(regex1), self._create(regex2)),
+                    (True, None),
+                )
+
+    def test_counterexample(self):
+        """Test that a different language gives a string accepted by only one."""
+        automaton1 = self._create("(a+b)*.a.(a+b)")
+        automaton2 = self._create("(a+b)*.a")
+        is_equivalent, counterexample = equivalent(automaton1, automaton2)
+
+        self.assertFalse(is_equivalent)
+        self.assertNotEqual(automaton1.accepts(counterexample), automaton2.accepts(counterexample))
+
+    def test_included(self):
+        """Test inclusion in both directions."""
+        automaton1 = self._create("a.(a+b)*.b")
+        automaton2 = AutomataFormat.read("""
+        Automaton:
+            Symbols: ab
+
+            q0
+            q1 final
+
+            ini q0 -a-> q1
+            q0 -b-> q1
+            q1 -a-> q0
+            q1 -b-> q0
+        """)
+
+        self.assertEqual(included(automaton1, self._create("(a+b)*")), (True, None))
+        self.assertEqual(included(automaton1, automaton2), (False, "ab"))
+
+        is_included, counterexample = included(self._create("(a+b)*"), automaton1)
+        self.assertFalse(is_included)
+        self.assertFalse(automaton1.accepts(counterexample))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,24 @@
 """Test evaluation of automatas."""
 import unittest
+from unittest import mock
 from abc import ABC, abstractmethod
 from typing import Optional, Type
 
 from automaton import FiniteAutomaton
+from re_parser import REParser
 from utils import AutomataFormat
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class TestEvaluatorBase(ABC, unittest.TestCase):
     """Base class for string acceptance tests."""
 
+    engine: Optional[str] = None
+
     @abstractmethod
     def _create_automata(self):
         pass
@@ -19,7 +28,7 @@ class TestEvaluatorBase(ABC, unittest.TestCase):
         self.automaton = self._create_automata()
 
     def _check_accept_body(self, string, should_accept = True):
-        accepted = self.automaton.accepts(string) # Función a evaluar
+        accepted = self.automaton.accepts(string, engine=self.engine) # Función a evaluar
         self.assertEqual(accepted, should_accept)
 
     def _check_accept(self, string, should_accept = True, exception = None):
@@ -68,6 +77,32 @@ class TestEvaluatorFixed(TestEvaluatorBase):
         self._check_accept("aHello", should_accept=False)
         self._check_accept("Helloa", should_accept=False)
 
+    def test_fixed_matcher(self):
+        """Test evaluation of a string fed in chunks."""
+        matcher = self.automaton.to_deterministic().matcher()
+
+        self.assertTrue(matcher.feed("He"))
+        self.assertFalse(matcher.is_accepting())
+        self.assertTrue(matcher.feed("llo"))
+        self.assertTrue(matcher.is_accepting())
+        self.assertFalse(matcher.feed("o" * 1000))
+        self.assertTrue(matcher.dead())
+        self.assertEqual(matcher.consumed, 6)
+
+        matcher = self.automaton.matcher()
+        self.assertFalse(matcher.consume(iter(["Hel", "la", "Hello"])))
+        self.assertEqual(matcher.consumed, 5)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_fixed_array(self):
+        """Test vectorized evaluation of a padded batch."""
+        strings = ["Hello", "Helloo", "Hell", "llH", "", "Hella", "aHello", "Helloa"]
+        accepted = self.automaton.accepts_array(strings)
+
+        self.assertEqual(accepted.tolist(), [True] + [False] * 7)
+        with self.assertRaises(ValueError):
+            self.automaton.accepts_array(strings, width=4)
+
 
 class TestEvaluatorLambdas(TestEvaluatorBase):
     """Test for a fixed string."""
@@ -95,6 +130,25 @@ class TestEvaluatorLambdas(TestEvaluatorBase):
         self._check_accept("", should_accept=True)
         self._check_accept("a", should_accept=False)
 
+    def test_lambda_cycle(self):
+        """Test that lambda closures are recomputed after a new transition."""
+        self.automaton.add_transition("4", None, "1")
+        self.automaton.add_transition("3", "a", "1")
+        self._check_accept("a", should_accept=True)
+        self._check_accept("aa", should_accept=True)
+        self.assertEqual(self.automaton._lambda_check({"2"}), {"1", "2", "3", "4"})
+
+    def test_lambda_long_alternation(self):
+        """Test that lambda closures are stored in space linear in the automaton."""
+        self.automaton = REParser().create_automaton("+".join("ab"[i % 2] for i in range(300)))
+        self._check_accept("a", should_accept=True)
+        self._check_accept("b", should_accept=True)
+        self._check_accept("ab", should_accept=False)
+
+        _, members, successors = self.automaton._lambda_components()
+        stored = sum(map(len, members)) + sum(map(len, successors))
+        self.assertLessEqual(stored, 2 * len(self.automaton.states))
+
 
 class TestEvaluatorNumber(TestEvaluatorBase):
     """Test for a fixed string."""
@@ -142,6 +196,65 @@ class TestEvaluatorNumber(TestEvaluatorBase):
         self._check_accept("0.0.0", should_accept=False)
         self._check_accept("0-0.0", should_accept=False)
 
+    def test_number_many(self):
+        """Test batch evaluation of sorted strings."""
+        strings = ["", "-", "-0", "-0.", "-0.1", "-0.10", "-1", "0", "0.0", "0.0.0", "1a"]
+        expected = bytearray(self.automaton.accepts(string) for string in strings)
+
+        self.assertEqual(self.automaton.accepts_many(strings), expected)
+        deterministic = self.automaton.to_deterministic()
+        self.assertEqual(deterministic.accepts_many(iter(strings)), expected)
+
+    def test_number_nondeterministic_engine(self):
+        """Test that an NFA goes to the bitset engine without compiling."""
+        self.automaton.accepts_many(["0"])
+        if self.automaton._is_deterministic():
+            return
+        with mock.patch("automaton.CompiledAutomaton", side_effect=AssertionError):
+            self.automaton.accepts_many(["-1", "0.5"])
+            self.automaton.matcher().feed("-1")
+
+
+class TestEvaluatorFixedCompiled(TestEvaluatorFixed):
+    """Test for a fixed string using the compiled transition table."""
+
+    def _create_automata(self):
+        automaton = super()._create_automata()
+        automaton.compile()
+        return automaton
+
+    def test_recompile_after_transition(self):
+        """Test that adding a transition discards the compiled table."""
+        self._check_accept("Hellooo", should_accept=False)
+        self.automaton.add_transition("Hello", "o", "Hello")
+        self._check_accept("Hellooo", should_accept=True)
+        self.automaton.compile()
+        self._check_accept("Hellooo", should_accept=True)
+
+    def test_compile_nondeterministic(self):
+        """Test that only deterministic automata can be compiled."""
+        self.automaton.add_transition("H", "e", "Hello")
+        with self.assertRaises(ValueError):
+            self.automaton.compile()
+
+
+class TestEvaluatorFixedBitset(TestEvaluatorFixed):
+    """Test for a fixed string with the bitset engine."""
+
+    engine = "bitset"
+
+
+class TestEvaluatorLambdasBitset(TestEvaluatorLambdas):
+    """Test for lambda transitions with the bitset engine."""
+
+    engine = "bitset"
+
+
+class TestEvaluatorNumberBitset(TestEvaluatorNumber):
+    """Test for numbers with the bitset engine."""
+
+    engine = "bitset"
+
 
 if __name__ == '__main__':
     unittest.main()
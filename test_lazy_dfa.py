@@ -0,0 +1,52 @@
+"""Test evaluation with the lazy deterministic automaton."""
+import unittest
+
+from lazy_dfa import LazyDFA
+from re_parser import REParser
+
+
+class TestLazyDFA(unittest.TestCase):
+    """Tests for the lazy deterministic automaton."""
+
+    def _check_accept(self, evaluator, string, should_accept = True):
+        with self.subTest(string=string):
+            accepted = evaluator.accepts(string)
+            self.assertEqual(accepted, should_accept)
+
+    def test_number(self):
+        """Test a regex for numbers."""
+        evaluator = LazyDFA(REParser().create_automaton("(0+1.(0+1)*).,.(0+1)*"))
+
+        self._check_accept(evaluator, "0,", should_accept=True)
+        self._check_accept(evaluator, "10,01", should_accept=True)
+        self._check_accept(evaluator, "01,1", should_accept=False)
+        self._check_accept(evaluator, "1", should_accept=False)
+        self._check_accept(evaluator, ",1", should_accept=False)
+        self._check_accept(evaluator, "1,a", should_accept=False)
+
+    def test_cache_counters(self):
+        """Test that repeated strings are served from the cache."""
+        evaluator = LazyDFA(REParser().create_automaton("(a+b)*.a"))
+
+        self._check_accept(evaluator, "abba", should_accept=True)
+        misses = evaluator.misses
+        self._check_accept(evaluator, "abba", should_accept=True)
+        self.assertEqual(evaluator.misses, misses)
+        self.assertEqual(evaluator.hits, 4)
+        self.assertEqual(evaluator.evictions, 0)
+
+    def test_bounded_cache(self):
+        """Test that the cache never exceeds its bound."""
+        automaton = REParser().create_automaton("(a+b)*.a.(a+b).(a+b).(a+b)")
+        evaluator = LazyDFA(automaton, max_transitions=4, window=8)
+
+        for string in ["abababab", "bbbbaaaa", "aabbaabb", "babababa"] * 4:
+            self._check_accept(evaluator, string, automaton.accepts(string))
+
+        self.assertLessEqual(len(evaluator.cache), 4)
+        self.assertGreater(evaluator.evictions, 0)
+        self.assertGreater(evaluator.fallbacks, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
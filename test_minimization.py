@@ -9,9 +9,11 @@ from utils import AutomataFormat, deterministic_automata_isomorphism
 class TestMinimize(ABC, unittest.TestCase):
     """Base class for string acceptance tests."""
 
+    strategy = "hopcroft"
+
     def _check_minimize(self, automaton, simplified):
         """Test that the minimized automaton is the simplified one."""
-        minimized = automaton.to_minimized()
+        minimized = automaton.to_minimized(strategy=self.strategy)
         equiv_map = deterministic_automata_isomorphism(minimized, simplified)
 
         self.assertTrue(equiv_map is not None)
@@ -125,6 +127,128 @@ class TestMinimize(ABC, unittest.TestCase):
 
         self._check_minimize(automaton, simplified)
 
+    def test_incomplete_automaton(self):
+        """Test an automaton with missing transitions."""
+        automaton_str = """
+        Automaton:
+            Symbols: ab
+
+            Initial
+            A1 final
+            A2 final
+
+            ini Initial -a-> A1
+            A1 -a-> A2
+            A2 -a-> A1
+        """
+
+        automaton = AutomataFormat.read(automaton_str)
+
+        simplified_str = """
+        Automaton:
+            Symbols: ab
+
+            Initial
+            A final
+
+            ini Initial -a-> A
+            A -a-> A
+        """
+
+        simplified = AutomataFormat.read(simplified_str)
+
+        self._check_minimize(automaton, simplified)
+
+    def test_block_name_collision(self):
+        """Test blocks whose concatenated state names coincide."""
+        automaton_str = """
+        Automaton:
+            Symbols: abcd
+
+            s
+            x
+            yz
+            xy
+            z
+            f final
+
+            ini s -a-> x
+            s -c-> yz
+            s -b-> xy
+            s -d-> z
+            x -a-> f
+            yz -a-> f
+            xy -b-> f
+            z -b-> f
+        """
+
+        automaton = AutomataFormat.read(automaton_str)
+        minimized = automaton.to_minimized(strategy=self.strategy)
+
+        for string in ["aa", "ca", "bb", "db", "ab", "cb", "ba", "da"]:
+            with self.subTest(string=string):
+                self.assertEqual(minimized.accepts(string), automaton.accepts(string))
+
+
+class TestMinimizeBrzozowski(TestMinimize):
+    """Minimization tests with Brzozowski's algorithm."""
+
+    strategy = "brzozowski"
+
+    def test_nondeterministic(self):
+        """Test that an NFA gives the same automaton as determinizing first."""
+        automaton_str = """
+        Automaton:
+            Symbols: ab
+
+            Initial
+            A
+            B final
+
+            ini Initial -a-> Initial
+            Initial -b-> Initial
+            Initial -a-> A
+            A -b-> B
+        """
+
+        automaton = AutomataFormat.read(automaton_str)
+        simplified = automaton.to_deterministic().to_minimized()
+
+        self._check_minimize(automaton, simplified)
+        self.assertEqual(
+            automaton.to_minimized(strategy=self.strategy).initial_state, simplified.initial_state)
+
+
+class TestMinimizeIncremental(TestMinimize):
+    """Minimization tests with the incremental algorithm."""
+
+    strategy = "incremental"
+
+    def test_time_budget(self):
+        """Test that an exhausted time budget keeps the language."""
+        automaton_str = """
+        Automaton:
+            Symbols: ab
+
+            Initial
+            B1 final
+            B2 final
+
+            ini Initial -a-> B1
+            B1 -a-> B1
+            B1 -b-> B2
+            B2 -a-> B1
+            B2 -b-> B1
+        """
+
+        automaton = AutomataFormat.read(automaton_str)
+        minimized = automaton.to_minimized(strategy=self.strategy, time_budget=0)
+
+        self.assertEqual(len(minimized.states), 3)
+        for string in ["", "a", "ab", "abba", "b", "ba"]:
+            with self.subTest(string=string):
+                self.assertEqual(minimized.accepts(string), automaton.accepts(string))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,45 @@
+"""Test evaluation of many regexes at once."""
+import unittest
+
+from multi_pattern import MultiPattern
+from re_parser import REParser
+
+
+class TestMultiPattern(unittest.TestCase):
+    """Tests for the multi-pattern matcher."""
+
+    def _check_match(self, matcher, string, pattern_ids):
+        with self.subTest(string=string):
+            self.assertEqual(matcher.match(string), frozenset(pattern_ids))
+
+    def test_list(self):
+        """Test patterns identified by position."""
+        matcher = MultiPattern(["a*.b*", "a.b", "(a+b)*.a", "c"])
+
+        self._check_match(matcher, "", [0])
+        self._check_match(matcher, "ab", [0, 1])
+        self._check_match(matcher, "aa", [0, 2])
+        self._check_match(matcher, "ba", [2])
+        self._check_match(matcher, "c", [3])
+        self._check_match(matcher, "bc", [])
+        self._check_match(matcher, "x", [])
+
+    def test_dict(self):
+        """Test patterns with explicit identifiers against each automaton."""
+        patterns = {"ones": "1*", "even": "((0+1).(0+1))*", "zero": "0.(0+1)*"}
+        matcher = MultiPattern(patterns)
+        automata = {
+            pattern_id: REParser().create_automaton(regex)
+            for pattern_id, regex in patterns.items()
+        }
+
+        for string in ["", "1", "11", "0", "01", "011", "0110", "1011"]:
+            expected = [
+                pattern_id for pattern_id, automaton in automata.items()
+                if automaton.accepts(string)
+            ]
+            self._check_match(matcher, string, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
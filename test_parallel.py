@@ -0,0 +1,45 @@
+"""Test sharded multiprocess evaluation."""
+import os
+import tempfile
+import unittest
+
+from parallel import accepted_offsets
+from re_parser import REParser
+
+
+class TestParallel(unittest.TestCase):
+    """Tests for the sharded evaluation of files."""
+
+    def setUp(self):
+        """Write an input file with one string per line."""
+        self.lines = ["ab", "", "aab", "ba", "abbb", "b", "a"] * 20 + ["ab"]
+        file = tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False)
+        with file:
+            file.write("\n".join(self.lines))
+        self.path = file.name
+
+    def tearDown(self):
+        """Remove the input file."""
+        os.remove(self.path)
+
+    def test_offsets(self):
+        """Test that the accepted offsets match a sequential evaluation."""
+        automaton = REParser().create_automaton("a*.b*")
+
+        expected = []
+        offset = 0
+        for line in self.lines:
+            if automaton.accepts(line):
+                expected.append(offset)
+            offset += len(line) + 1
+
+        stats = {}
+        offsets = list(accepted_offsets(automaton, self.path, workers=2, chunk_size=16, stats=stats))
+
+        self.assertEqual(offsets, expected)
+        self.assertEqual(sum(worker["lines"] for worker in stats.values()), len(self.lines))
+        self.assertEqual(sum(worker["bytes"] for worker in stats.values()), offset - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Test boolean operations on automata with the product construction."""
+import itertools
+import unittest
+
+from re_parser import REParser
+from utils import AutomataFormat, is_deterministic
+
+
+class TestProduct(unittest.TestCase):
+    """Tests for intersection, difference, symmetric difference and complement."""
+
+    def setUp(self):
+        self.even = REParser().create_automaton("((a+b).(a+b))*")
+        self.ends_a = REParser().create_automaton("(a+b)*.a")
+        self.strings = [
+            "".join(string)
+            for length in range(6)
+            for string in itertools.product("ab", repeat=length)
+        ]
+
+    def _check_operation(self, automaton, expected):
+        self.assertTrue(is_deterministic(automaton))
+        minimized = automaton.to_minimized()
+        for string in self.strings:
+            with self.subTest(string=string):
+                self.assertEqual(automaton.accepts(string), expected(string))
+                self.assertEqual(minimized.accepts(string), expected(string))
+
+    def test_intersect(self):
+        """Test the intersection of two languages."""
+        self._check_operation(
+            self.even.intersect(self.ends_a),
+            lambda string: len(string) % 2 == 0 and string.endswith("a"),
+        )
+
+    def test_difference(self):
+        """Test the difference of two languages."""
+        self._check_operation(
+            self.even.difference(self.ends_a),
+            lambda string: len(string) % 2 == 0 and not string.endswith("a"),
+        )
+
+    def test_xor(self):
+        """Test the symmetric difference of two languages."""
+        self._check_operation(
+            self.even.xor(self.ends_a),
+            lambda string: (len(string) % 2 == 0) != string.endswith("a"),
+        )
+
+    def test_complement(self):
+        """Test the complement, also over a larger alphabet."""
+        self._check_operation(
+            self.ends_a.complement(),
+            lambda string: not string.endswith("a"),
+        )
+
+        complement = self.ends_a.complement(symbols="c")
+        self.assertTrue(complement.accepts("ac"))
+        self.assertTrue(complement.accepts("ca"))
+        self.assertFalse(complement.accepts("ba"))
+
+    def test_different_alphabets(self):
+        """Test partial automata over different alphabets."""
+        automaton = AutomataFormat.read("""
+        Automaton:
+            Symbols: ac
+
+            q0
+            q1 final
+
+            ini q0 -a-> q1
+            q1 -c-> q0
+        """)
+        union = self.ends_a.xor(automaton).xor(self.ends_a.intersect(automaton))
+
+        for string in ["a", "aca", "ba", "aa", "ac", "c", ""]:
+            with self.subTest(string=string):
+                self.assertEqual(
+                    union.accepts(string),
+                    self.ends_a.accepts(string) or automaton.accepts(string),
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
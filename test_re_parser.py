@@ -2,7 +2,7 @@
 import unittest
 
 from automaton import FiniteAutomaton
-from re_parser import REParser
+from re_parser import AutomatonCache, REParser
 
 
 class TestREParser(unittest.TestCase):
@@ -82,6 +82,76 @@ class TestREParser(unittest.TestCase):
         self._check_accept(evaluator, "13,", should_accept=True)
         self._check_accept(evaluator, "3,7,12", should_accept=False)
 
+    def test_lambda(self):
+        """Test empty string and empty language."""
+        evaluator = self._create_evaluator("a.(λ+b)")
+
+        self._check_accept(evaluator, "a", should_accept=True)
+        self._check_accept(evaluator, "ab", should_accept=True)
+        self._check_accept(evaluator, "", should_accept=False)
+        self._check_accept(evaluator, "abb", should_accept=False)
+
+        evaluator = self._create_evaluator("")
+
+        self._check_accept(evaluator, "", should_accept=False)
+        self._check_accept(evaluator, "a", should_accept=False)
+
+
+class TestREParserGlushkov(TestREParser):
+    """Tests for regex parser building position automata."""
+
+    def _create_evaluator(self, regex):
+        automaton = REParser(mode="glushkov").create_automaton(regex)
+        return automaton
+
+    def test_positions(self):
+        """Test that there is one state per symbol and no lambdas."""
+        evaluator = self._create_evaluator("(a+b)*.a.λ.(a+b)")
+
+        self.assertEqual(len(evaluator.get_states()), 6)
+        for symbol_transitions in evaluator.get_transitions().values():
+            self.assertNotIn(None, symbol_transitions)
+
+
+class TestAutomatonCache(unittest.TestCase):
+    """Tests for the cache of regex automata."""
+
+    def test_cache(self):
+        """Test hits, misses and shared entries."""
+        cache = AutomatonCache(max_size=2)
+
+        automaton = cache.get("(a.b)*")
+        self.assertIs(cache.get("((a.b))*"), automaton)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "size": 1})
+
+        minimized = cache.get("(a.b)*", form="minimized")
+        self.assertTrue(minimized.accepts("abab"))
+        self.assertFalse(minimized.accepts("aba"))
+        self.assertIs(cache.get("(a.b)*", form="nfa"), automaton)
+
+    def test_eviction(self):
+        """Test that the least recently used regex is evicted."""
+        cache = AutomatonCache(max_size=2)
+
+        first = cache.get("a")
+        cache.get("b")
+        cache.get("a")
+        cache.get("c")
+
+        self.assertEqual(cache.stats()["size"], 2)
+        self.assertIs(cache.get("a"), first)
+        self.assertEqual(cache.stats()["misses"], 3)
+        cache.get("b")
+        self.assertEqual(cache.stats()["misses"], 4)
+
+    def test_mode(self):
+        """Test that each construction mode has its own entries."""
+        cache = AutomatonCache()
+
+        self.assertIsNot(cache.get("a*", mode="glushkov"), cache.get("a*"))
+        with self.assertRaises(ValueError):
+            cache.get("a*", form="dfa")
+
 
 if __name__ == "__main__":
     unittest.main()
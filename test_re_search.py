@@ -0,0 +1,65 @@
+"""Test search of regex matches inside a text."""
+import tracemalloc
+import unittest
+
+from re_search import RESearcher
+
+
+class TestRESearch(unittest.TestCase):
+    """Tests for the regex searcher."""
+
+    def _check_finditer(self, regex, text, matches):
+        with self.subTest(regex=regex, text=text):
+            self.assertEqual(list(RESearcher(regex).finditer(text)), matches)
+
+    def test_fixed(self):
+        """Test search of a fixed string."""
+        self._check_finditer("H.e.l.l.o", "Hello, Hello!", [(0, 5), (7, 12)])
+        self._check_finditer("H.e.l.l.o", "Hell", [])
+        self.assertEqual(RESearcher("H.e.l.l.o").search("xxHelloxx"), (2, 7))
+        self.assertIsNone(RESearcher("H.e.l.l.o").search("xxHellxx"))
+
+    def test_leftmost_longest(self):
+        """Test leftmost-longest semantics."""
+        self._check_finditer("a+a.b", "xaab", [(1, 2), (2, 4)])
+        self._check_finditer("a*.b", "aaab-ab", [(0, 4), (5, 7)])
+        self._check_finditer("(a.b)*.a", "abababa", [(0, 7)])
+
+    def test_empty_matches(self):
+        """Test regexes that accept the empty string."""
+        self._check_finditer("b*", "abba", [(0, 0), (1, 3), (3, 3), (4, 4)])
+
+    def test_linear_steps(self):
+        """Test that every (position, state) pair is expanded at most once."""
+        searcher = RESearcher("a+(a.a)*.b")
+        forward = searcher.forward
+        steps = 0
+        step = forward.step
+
+        def counting_step(state, symbol):
+            nonlocal steps
+            steps += 1
+            return step(state, symbol)
+
+        forward.step = counting_step
+        text = "a" * 2000
+        self.assertEqual(len(list(searcher.finditer(text))), len(text))
+        self.assertLessEqual(steps, len(forward.final) * (len(text) + 1))
+
+    def test_bounded_memory(self):
+        """Test that positions behind the last match are forgotten."""
+        searcher = RESearcher("a.b")
+        text = "ab" * 20000
+        tracemalloc.start()
+        try:
+            matches = sum(1 for _ in searcher.finditer(text))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(matches, len(text) // 2)
+        self.assertLess(peak, 8 * len(text))
+
+
+if __name__ == '__main__':
+    unittest.main()
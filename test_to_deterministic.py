@@ -59,6 +59,72 @@ class TestTransform(ABC, unittest.TestCase):
 
         self._check_transform(automaton, expected)
 
+    def test_subset_name_collision(self):
+        """Test subsets whose concatenated state names coincide."""
+        automaton_str = """
+        Automaton:
+        Symbols: abc
+
+        s
+        x
+        yz
+        xy
+        z
+        f final
+
+        ini s -a-> x
+        s -a-> yz
+        s -b-> xy
+        s -b-> z
+        x -c-> f
+        """
+
+        automaton = AutomataFormat.read(automaton_str)
+        transformed = automaton.to_deterministic()
+
+        self.assertTrue(transformed.accepts("ac"))
+        self.assertFalse(transformed.accepts("bc"))
+        self.assertEqual(transformed.state_label(transformed.initial_state), "{s}")
+        self.assertEqual(len(transformed.states), len(set(map(transformed.state_label, transformed.states))))
+
+    def test_compact_transitions(self):
+        """Test the read-only view of compact transitions."""
+        automaton_str = """
+        Automaton:
+        Symbols: ab
+
+        q0
+        q1
+        q2 final
+
+        ini q0 -a-> q1
+        q0 -a-> q2
+        q0 --> q2
+        q1 -b-> q2
+        """
+
+        automaton = AutomataFormat.read(automaton_str)
+        transitions = automaton.get_transitions()
+        deterministic = automaton.to_deterministic()
+        self.assertEqual(automaton.compact().get_transitions(), transitions)
+        self.assertNotIn("q2", automaton.transitions)
+        self.assertEqual(automaton.transitions["q0"][None], {"q2"})
+        self.assertEqual(list(automaton.transitions["q0"]), ["a", None])
+        with self.assertRaises(TypeError):
+            automaton.transitions["q2"] = {}
+        self.assertTrue(automaton.accepts("ab"))
+
+        automaton.add_transition("q2", "b", "q0")
+        self.assertTrue(automaton.accepts("abbab"))
+        self.assertEqual(automaton.transitions["q2"], {"b": {"q0"}})
+        self.assertTrue(deterministic.accepts("ab"))
+        self.assertFalse(deterministic.accepts("abbab"))
+        self.assertIsNotNone(deterministic._compiled)
+        row = deterministic.transitions[deterministic.initial_state]
+        self.assertIn("a", row)
+        self.assertNotIn(None, row)
+        self.assertEqual(dict(row.items()), {symbol: row[symbol] for symbol in row})
+
 
 if __name__ == '__main__':
     unittest.main()
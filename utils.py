@@ -1,4 +1,5 @@
 """General utilities to work with automatas."""
+import io
 import re
 import automaton as aut
 from collections import deque, defaultdict
@@ -7,77 +8,158 @@ from collections import deque, defaultdict
 class FormatParseError(Exception):
     """Exception for parsing problems."""
 
+    def __init__(self, message, line_number=None):
+        if line_number is not None:
+            message = f"Line {line_number}: {message}"
+        super().__init__(message)
+        self.line_number = line_number
+
+
+def _is_word(token):
+    # Equivale a \w+ de re: caracteres alfanuméricos o guion bajo
+    return token.isalnum() or token.replace("_", "a").isalnum()
+
 
 class AutomataFormat():
     """Custom format to write and read automata."""
 
-    re_comment = re.compile(r"\s*#\.*")  # : Final
-    re_empty = re.compile(r"\s*")  # : Final
-    re_automaton = re.compile(r"\s*Automaton:\s*")  # : Final
-    re_state = re.compile(r"\s*(\w+)(?:\s*(final))?\s*")  # : Final
-    re_transition = re.compile(r"\s*(\w+)\s*-(\S)?->\s*(\w+)\s*")  # : Final
-    re_initial = re.compile(r"\s*ini\s(\w+)\s*-(\S)?->\s*(\w+)\s*")  # : Final
-    re_symbols = re.compile(r"\s*Symbols:\s*(\S*)\s*")  # : Final
+    # Patrón de respaldo para las líneas que no separa bien split(): un único
+    # patrón para todos los tipos de línea, el grupo que captura indica el tipo
+    re_line = re.compile(r"""
+        \s*(?:
+            (?P<comment>\#.*)
+          | (?P<automaton>Automaton:)
+          | Symbols:\s*(?P<symbols>\S*)
+          | (?P<initial>ini\s+)?(?P<source>\w+)\s*-(?P<symbol>\S)?->\s*(?P<target>\w+)
+          | (?P<state>\w+)(?:\s*(?P<final>final))?
+        )?\s*
+    """, re.VERBOSE)  # : Final
+
+    @classmethod
+    def _scan_line(cls, line):
+        """
+        Split a line of the format in its tokens.
+
+        Args:
+            line: Line to scan. Type: str
+
+        Returns:
+            ``None`` for blank lines and comments, ``("automaton",)``,
+            ``("symbols", symbols)``, ``("state", name, final)`` or
+            ``("transition", initial, source, symbol, target)``, or
+            ``False`` if the line is invalid.
+
+        """
+        # Camino rápido con split() para las líneas con el espaciado habitual
+        tokens = line.split()
+        n_tokens = len(tokens)
+        if n_tokens == 0:
+            return None
+        first = tokens[0]
+        if first[0] == "#":
+            return None
+
+        if n_tokens >= 3:
+            arrow = tokens[-2]
+            if (
+                n_tokens == (4 if first == "ini" else 3)
+                and len(arrow) in (3, 4) and arrow[0] == "-" and arrow[-2:] == "->"
+                and _is_word(tokens[-3]) and _is_word(tokens[-1])
+            ):
+                symbol = arrow[1] if len(arrow) == 4 else None
+                return ("transition", n_tokens == 4, tokens[-3], symbol, tokens[-1])
+        elif _is_word(first) and (n_tokens == 1 or tokens[1] == "final"):
+            return ("state", first, n_tokens == 2)
+        elif first == "Automaton:" and n_tokens == 1:
+            return ("automaton",)
+        elif first == "Symbols:":
+            return ("symbols", tokens[1] if n_tokens == 2 else "")
+
+        match = cls.re_line.fullmatch(line)
+        if match is None:
+            return False
+        groups = match.groupdict()
+        if groups["source"] is not None:
+            return ("transition", groups["initial"] is not None,
+                    groups["source"], groups["symbol"], groups["target"])
+        if groups["state"] is not None:
+            return ("state", groups["state"], groups["final"] is not None)
+        if groups["symbols"] is not None:
+            return ("symbols", groups["symbols"])
+        if groups["automaton"] is not None:
+            return ("automaton",)
+        return None
 
     @classmethod
     def read(cls, description):
-        """Read the automaton string description in our custom format."""
-        splitted_lines = description.splitlines()
-        prelude_read = False
+        """
+        Read an automaton description in our custom format.
 
-        states = []
-        final_states = set()
+        Lines are processed one at a time, so a file object can be read
+        without loading it whole.
 
-        automata = aut.FiniteAutomaton("", [], set(), {}, set())
+        Args:
+            description: Description as a string, a file object or any
+                iterable of lines. Type: Union[str, Iterable[str]]
 
-        for line in splitted_lines:
-            if cls.re_comment.fullmatch(line) or cls.re_empty.fullmatch(line):
-                continue
+        Returns:
+            Automaton described. Type: FiniteAutomaton
 
-            if prelude_read:
-                match = cls.re_symbols.fullmatch(line)
-                if match:
-                    symbols_str = match.groups()[0]
-                    symbols = tuple(symbols_str)
-                    continue
-
-                match = cls.re_state.fullmatch(line)
-                if match:
-                    state_name, final_text = match.groups()
-                    states.append(state_name)
-                    if bool(final_text): final_states.add(state_name)
-                    continue
-
-                match = cls.re_initial.fullmatch(line)
-                if match:
-                    state_name = match.groups()[0]
-                    initial_state = state_name
-                    line = line.replace('ini ', '')
-
-                match = cls.re_transition.fullmatch(line)
-                if match:
-                    state1_name, symbol, state2_name = match.groups()
-
-                    automata.add_transition(
-                        state1_name, symbol, state2_name)
-                    continue
-
-            elif cls.re_automaton.fullmatch(line):
-                prelude_read = True
+        Raises:
+            FormatParseError: If a line is invalid (reporting its line
+                number) or there is no initial state or symbol list.
+
+        """
+        if isinstance(description, str):
+            description = io.StringIO(description)
+
+        prelude_read = False
+        initial_state = None
+        symbols = None
+        states = set()
+        final_states = set()
+        transitions = {}
+
+        scan_line = cls._scan_line
+        for line_number, line in enumerate(description, start=1):
+            tokens = scan_line(line)
+            if tokens is None:
                 continue
+            if tokens is False:
+                raise FormatParseError(f"Invalid line: {line.strip()}", line_number)
 
-            raise FormatParseError(f"Invalid line: {line}")
-        
+            kind = tokens[0]
+            if kind == "automaton":
+                if prelude_read:
+                    raise FormatParseError("Duplicated automaton header", line_number)
+                prelude_read = True
+            elif not prelude_read:
+                raise FormatParseError(f"Expected automaton header: {line.strip()}", line_number)
+            elif kind == "transition":
+                _, initial, source, symbol, target = tokens
+                if initial:
+                    initial_state = source
+                transitions.setdefault(source, {}).setdefault(symbol, set()).add(target)
+            elif kind == "state":
+                states.add(tokens[1])
+                if tokens[2]:
+                    final_states.add(tokens[1])
+            else:
+                symbols = tuple(tokens[1])
 
         if initial_state is None:
             raise FormatParseError("No initial state defined")
 
-        automata.initial_state = initial_state
-        automata.symbols = symbols
-        automata.states = states
-        automata.final_states = final_states
+        if symbols is None:
+            raise FormatParseError("No symbols defined")
 
-        return automata
+        return aut.FiniteAutomaton(
+            initial_state=initial_state,
+            states=states,
+            symbols=symbols,
+            transitions=transitions,
+            final_states=final_states,
+        )
 
 def _get_all_transitions(automaton):
     automaton_all_transitions = []
@@ -169,3 +251,331 @@ def deterministic_automata_isomorphism(automaton1, automaton2):
                 pending.appendleft((final1, final2))
 
     return equiv_map
+
+
+def _alphabet(*automata):
+    symbols = {}
+    for automaton in automata:
+        symbols.update(dict.fromkeys(automaton.symbols))
+        for symbol_transitions in automaton.transitions.values():
+            symbols.update(dict.fromkeys(symbol_transitions))
+    symbols.pop(None, None)
+    return tuple(symbols)
+
+
+def _subset_step(automaton, subset, symbol):
+    targets = set()
+    for state in subset:
+        targets |= automaton.get_final_states_from_symbol_transitions(state, symbol)
+    return frozenset(automaton._lambda_check(targets))
+
+
+def _hopcroft_karp(left, right, symbols):
+    """
+    Search a string accepted by exactly one of two groups of automata.
+
+    Each side is the union of its automata, determinized on the fly: a
+    state is a tuple with one (lambda-closed) subset per automaton. Pairs
+    of states are explored in breadth-first order and merged with
+    union-find, so each class of equivalent states is checked only once.
+
+    Args:
+        left: Automata of the left side. Type: Sequence[FiniteAutomaton]
+        right: Automata of the right side. Type: Sequence[FiniteAutomaton]
+        symbols: Alphabet. Type: Sequence[str]
+
+    Returns:
+        A string accepted by only one side (found in breadth-first order), or
+        ``None`` if both sides accept the same language. Type: Optional[str]
+
+    """
+    parent = {}
+
+    def find(state):
+        root = state
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while state != root:
+            parent[state], state = root, parent.get(state, state)
+        return root
+
+    def initial(automata):
+        return tuple(
+            frozenset(automaton._lambda_check({automaton.initial_state}))
+            for automaton in automata
+        )
+
+    def accepts(automata, state):
+        return any(
+            not automaton.final_states.isdisjoint(subset)
+            for automaton, subset in zip(automata, state)
+        )
+
+    def step(automata, state, symbol):
+        return tuple(
+            _subset_step(automaton, subset, symbol)
+            for automaton, subset in zip(automata, state)
+        )
+
+    # Cada entrada guarda el par, la entrada anterior y el símbolo leído
+    pairs = [((0, initial(left)), (1, initial(right)), None, None)]
+    position = 0
+    while position < len(pairs):
+        left_state, right_state, _, _ = pairs[position]
+        left_root = find(left_state)
+        right_root = find(right_state)
+        if left_root != right_root:
+            if accepts(left, left_state[1]) != accepts(right, right_state[1]):
+                symbols_read = []
+                while position is not None:
+                    _, _, position, symbol = pairs[position]
+                    if symbol is not None:
+                        symbols_read.append(symbol)
+                return "".join(reversed(symbols_read))
+
+            parent[left_root] = right_root
+            for symbol in symbols:
+                pairs.append((
+                    (0, step(left, left_state[1], symbol)),
+                    (1, step(right, right_state[1], symbol)),
+                    position,
+                    symbol,
+                ))
+        position += 1
+
+    return None
+
+
+def equivalent(automaton1, automaton2):
+    """
+    Check if two automata accept the same language.
+
+    Uses Hopcroft and Karp's union-find algorithm, so neither automaton
+    has to be minimized or even deterministic: subsets are only built for
+    the pairs of states that are explored.
+
+    Args:
+        automaton1: First automaton. Type: FiniteAutomaton
+        automaton2: Second automaton. Type: FiniteAutomaton
+
+    Returns:
+        ``(True, None)`` if the languages are equal, otherwise ``False``
+        and a string accepted by only one of them.
+        Type: Tuple[bool, Optional[str]]
+
+    """
+    counterexample = _hopcroft_karp(
+        [automaton1], [automaton2], _alphabet(automaton1, automaton2)
+    )
+    return counterexample is None, counterexample
+
+
+def included(automaton1, automaton2):
+    """
+    Check if the language of an automaton is included in another one.
+
+    The inclusion holds when the union of both automata is equivalent to
+    the second one, which is checked as in ``equivalent``.
+
+    Args:
+        automaton1: Automaton whose language should be included.
+            Type: FiniteAutomaton
+        automaton2: Automaton whose language should include it.
+            Type: FiniteAutomaton
+
+    Returns:
+        ``(True, None)`` if the inclusion holds, otherwise ``False`` and a
+        string accepted by ``automaton1`` but not by ``automaton2``.
+        Type: Tuple[bool, Optional[str]]
+
+    """
+    counterexample = _hopcroft_karp(
+        [automaton1, automaton2], [automaton2], _alphabet(automaton1, automaton2)
+    )
+    return counterexample is None, counterexample
+
+
+def _simulation(automaton, symbols):
+    """
+    Compute the maximal simulation between the states of an automaton.
+
+    Lambda transitions are removed first: a state moves by a symbol to the
+    closure of the targets of its closure, and it is final if its closure
+    has a final state. A state ``p`` is simulated by ``q`` when ``q``
+    accepts at least the strings accepted from ``p``, as witnessed step
+    by step.
+
+    Args:
+        automaton: Automaton. Type: FiniteAutomaton
+        symbols: Alphabet. Type: Sequence[str]
+
+    Returns:
+        States that simulate each state (itself included).
+        Type: Dict[str, Set[str]]
+
+    """
+    states = set(automaton.states) | set(automaton.transitions)
+    for symbol_transitions in automaton.transitions.values():
+        for targets in symbol_transitions.values():
+            states |= targets
+
+    final = {
+        state for state in states
+        if not automaton.final_states.isdisjoint(automaton._lambda_check({state}))
+    }
+    post = {
+        (state, symbol): _subset_step(automaton, automaton._lambda_check({state}), symbol)
+        for state in states for symbol in symbols
+    }
+
+    simulated_by = {
+        state: {other for other in states if state not in final or other in final}
+        for state in states
+    }
+    changed = True
+    while changed:
+        changed = False
+        for state in states:
+            for other in list(simulated_by[state]):
+                if any(
+                    not any(target2 in simulated_by[target1] for target2 in post[other, symbol])
+                    for symbol in symbols for target1 in post[state, symbol]
+                ):
+                    simulated_by[state].discard(other)
+                    changed = True
+    return simulated_by
+
+
+def antichain_included(automaton1, automaton2, simulation=False, max_states=None):
+    """
+    Check language inclusion of NFAs with antichains, without determinizing.
+
+    Explores pairs formed by a state of ``automaton1`` and a (lambda-closed)
+    subset of states of ``automaton2`` reached by the same string. A pair
+    whose state is final and whose subset has no final state gives a
+    counterexample. A pair is not explored when another one with the same
+    state and a smaller subset has been, since it can only lead to fewer
+    counterexamples; the pairs kept form an antichain.
+
+    Args:
+        automaton1: Automaton whose language should be included.
+            Type: FiniteAutomaton
+        automaton2: Automaton whose language should include it.
+            Type: FiniteAutomaton
+        simulation: Also prune with the simulation relation of
+            ``automaton2``: states simulated by another state of the same
+            subset are dropped, and subsets are compared by simulation
+            instead of inclusion. Type: bool
+        max_states: Maximum number of explored pairs kept in memory; when
+            exceeded the check is abandoned. Type: Optional[int]
+
+    Returns:
+        Tuple with ``True`` if the inclusion holds, ``False`` if not or
+        ``None`` if ``max_states`` was exceeded; a string accepted by
+        ``automaton1`` but not by ``automaton2`` (or ``None``); and the
+        number of explored pairs. Type: Tuple[Optional[bool], Optional[str], int]
+
+    """
+    symbols = _alphabet(automaton1, automaton2)
+
+    if simulation:
+        simulated_by = _simulation(automaton2, symbols)
+
+        def prune(subset):
+            # Se quita cada estado simulado por otro que se conserva
+            kept = []
+            for state in sorted(subset):
+                if not any(other in simulated_by[state] for other in kept):
+                    kept = [other for other in kept if state not in simulated_by[other]]
+                    kept.append(state)
+            return frozenset(kept)
+
+        def covers(subset, other_subset):
+            # Lenguaje de other_subset incluido en el de subset
+            return all(
+                any(state in simulated_by[other] for state in subset)
+                for other in other_subset
+            )
+    else:
+        def prune(subset):
+            return subset
+
+        def covers(subset, other_subset):
+            return other_subset <= subset
+
+    def closure(subset):
+        return automaton2._lambda_check(subset)
+
+    antichain = {}
+    # Cada entrada guarda el par, la entrada anterior y el símbolo leído
+    pairs = []
+    pending = deque()
+
+    def add(state, subset, parent, symbol):
+        kept = antichain.setdefault(state, [])
+        if any(covers(subset, old) for old in kept):
+            return False
+        kept[:] = [old for old in kept if not covers(old, subset)]
+        kept.append(subset)
+        pairs.append((state, subset, parent, symbol))
+        pending.append(len(pairs) - 1)
+        return state in automaton1.final_states and automaton2.final_states.isdisjoint(closure(subset))
+
+    def counterexample(position):
+        symbols_read = []
+        while position is not None:
+            _, _, position, symbol = pairs[position]
+            if symbol is not None:
+                symbols_read.append(symbol)
+        return "".join(reversed(symbols_read))
+
+    initial_subset = prune(frozenset(closure({automaton2.initial_state})))
+    for state in automaton1._lambda_check({automaton1.initial_state}):
+        if add(state, initial_subset, None, None):
+            return False, counterexample(len(pairs) - 1), len(pairs)
+
+    while pending:
+        if max_states is not None and len(pairs) > max_states:
+            return None, None, len(pairs)
+
+        position = pending.popleft()
+        state, subset, _, _ = pairs[position]
+        closed = closure(subset)
+        for symbol in symbols:
+            next_subset = prune(_subset_step(automaton2, closed, symbol))
+            for next_state in _subset_step(automaton1, {state}, symbol):
+                if add(next_state, next_subset, position, symbol):
+                    return False, counterexample(len(pairs) - 1), len(pairs)
+
+    return True, None, len(pairs)
+
+
+def antichain_universal(automaton, symbols=None, simulation=False, max_states=None):
+    """
+    Check if an NFA accepts every string, without determinizing.
+
+    It is the inclusion (checked with ``antichain_included``) of the
+    language of all the strings over the alphabet.
+
+    Args:
+        automaton: Automaton to check. Type: FiniteAutomaton
+        symbols: Alphabet; by default, the symbols of the automaton.
+            Type: Optional[Iterable[str]]
+        simulation: Prune with the simulation relation. Type: bool
+        max_states: Maximum number of explored pairs. Type: Optional[int]
+
+    Returns:
+        Same as ``antichain_included``; the string is one rejected by the
+        automaton. Type: Tuple[Optional[bool], Optional[str], int]
+
+    """
+    if symbols is None:
+        symbols = _alphabet(automaton)
+    universal = aut.FiniteAutomaton(
+        initial_state="all",
+        states={"all"},
+        symbols=tuple(symbols),
+        transitions={"all": {symbol: {"all"} for symbol in symbols}},
+        final_states={"all"},
+    )
+    return antichain_included(universal, automaton, simulation, max_states)